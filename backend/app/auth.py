@@ -1,5 +1,12 @@
 """JWT authentication utilities."""
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Optional
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
@@ -8,10 +15,85 @@ from app.config import settings
 security = HTTPBearer()
 
 
+class TokenCache:
+    """
+    Bounded LRU cache of tokens that already passed verification.
+
+    Maps a SHA-256 digest of the token (the token itself is never stored)
+    to its user ID. An entry expires at the token's ``exp`` claim, or after
+    ``max_ttl`` seconds if that comes first. Entries are only valid for the
+    secret they were verified with: a different secret empties the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        max_ttl: float = 300,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._secret: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _check_secret(self, secret: str) -> None:
+        if secret != self._secret:
+            self._entries.clear()
+            self._secret = secret
+
+    def get(self, token: str, secret: str) -> Optional[str]:
+        """Return the user ID for a verified, unexpired token, or None."""
+        key = self._key(token)
+        with self._lock:
+            self._check_secret(secret)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, token: str, secret: str, user_id: str, exp: Optional[float]) -> None:
+        """Remember a token verified with ``secret`` until it expires."""
+        if self.max_entries <= 0:
+            return
+        expires_at = self.clock() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        key = self._key(token)
+        with self._lock:
+            self._check_secret(secret)
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_SIZE,
+    max_ttl=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
+
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> str:
     """
     Verify JWT token and return user_id.
 
+    Tokens seen before are answered from ``token_cache`` without decoding
+    or checking the signature again.
+
     Args:
         credentials: Bearer token from Authorization header
 
@@ -22,14 +104,19 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Security(security))
         HTTPException: If token is invalid or expired
     """
     token = credentials.credentials
+    secret = settings.BETTER_AUTH_SECRET
+
+    user_id = token_cache.get(token, secret)
+    if user_id is not None:
+        return user_id
 
     try:
         payload = jwt.decode(
             token,
-            settings.BETTER_AUTH_SECRET,
+            secret,
             algorithms=["HS256"]
         )
-        user_id: str = payload.get("sub")
+        user_id = payload.get("sub")
 
         if user_id is None:
             raise HTTPException(
@@ -37,6 +124,8 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Security(security))
                 detail="Invalid token: missing user ID"
             )
 
+        exp = payload.get("exp")
+        token_cache.set(token, secret, user_id, float(exp) if exp is not None else None)
         return user_id
 
     except JWTError as e:
@@ -12,11 +12,48 @@ class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     BETTER_AUTH_SECRET: str = os.getenv("BETTER_AUTH_SECRET", "")
 
+    # Verified JWTs kept in memory per worker; size 0 disables the cache
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "4096"))
+    AUTH_TOKEN_CACHE_TTL_SECONDS: float = float(
+        os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", "300")
+    )
+
     # CORS settings
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
     # AI settings
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
+    AI_BACKEND: str = os.getenv("AI_BACKEND", "gemini")  # "gemini" or "fake"
+    AI_TIMEOUT_SECONDS: float = float(os.getenv("AI_TIMEOUT_SECONDS", "20"))
+    AI_MAX_CONCURRENCY: int = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+    AI_FAKE_LATENCY_MS: float = float(os.getenv("AI_FAKE_LATENCY_MS", "0"))
+    AI_CACHE_SIZE: int = int(os.getenv("AI_CACHE_SIZE", "1024"))
+    AI_CACHE_TTL_SECONDS: float = float(os.getenv("AI_CACHE_TTL_SECONDS", "86400"))
+    # Batch categorization: tasks per prompt and prompts in flight per request
+    AI_BATCH_TOKEN_BUDGET: int = int(os.getenv("AI_BATCH_TOKEN_BUDGET", "2000"))
+    AI_BATCH_MAX_ITEMS: int = int(os.getenv("AI_BATCH_MAX_ITEMS", "50"))
+    AI_BATCH_CONCURRENCY: int = int(os.getenv("AI_BATCH_CONCURRENCY", "4"))
+    # Seconds between background suggestion refreshes; 0 generates on request
+    AI_SUGGESTIONS_REFRESH_SECONDS: float = float(
+        os.getenv("AI_SUGGESTIONS_REFRESH_SECONDS", "0")
+    )
+    # SQLite file shared by all workers on a node; empty disables the disk tier
+    AI_CACHE_PATH: str = os.getenv("AI_CACHE_PATH", "")
+
+    # Task change feed fan-out: "memory" (one worker) or "postgres" (LISTEN/NOTIFY)
+    CHANGE_FEED_BACKEND: str = os.getenv("CHANGE_FEED_BACKEND", "memory")
+    CHANGE_FEED_BUFFER: int = int(os.getenv("CHANGE_FEED_BUFFER", "256"))  # events per user
+
+    # Task read cache: "none", "redis" (shared by all pods) or "memory". A
+    # memory cache is only invalidated on the worker that wrote, so use it
+    # only when a single worker process serves all traffic.
+    TASK_CACHE_BACKEND: str = os.getenv("TASK_CACHE_BACKEND", "none")
+    TASK_CACHE_SIZE: int = int(os.getenv("TASK_CACHE_SIZE", "10000"))
+    TASK_CACHE_TTL_SECONDS: float = float(os.getenv("TASK_CACHE_TTL_SECONDS", "300"))
+    TASK_CACHE_URL: str = os.getenv("TASK_CACHE_URL", "redis://localhost:6379/0")
+
+    # Log every SQL statement; for local debugging only
+    SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
 
     # Environment
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
@@ -1,13 +1,45 @@
 """Database connection and session management."""
 
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.config import settings
+from app.metrics import instrument_pool
 
 database_url = settings.DATABASE_URL
 if database_url.startswith("postgres://"):
     database_url = database_url.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(database_url, echo=not settings.is_production)
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync database URL to its async driver equivalent.
+
+    postgresql:// uses asyncpg and sqlite:// uses aiosqlite. asyncpg spells
+    libpq's ``sslmode`` as ``ssl`` and does not accept ``channel_binding``,
+    so those query parameters are translated.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(
+            hide_password=False
+        )
+    if parsed.get_backend_name() == "postgresql":
+        query = dict(parsed.query)
+        query.pop("channel_binding", None)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return parsed.set(
+            drivername="postgresql+asyncpg", query=query
+        ).render_as_string(hide_password=False)
+    return url
+
+
+engine = create_engine(database_url, echo=settings.SQL_ECHO)
+async_engine = create_async_engine(to_async_url(database_url), echo=settings.SQL_ECHO)
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
 
 
 def create_db_and_tables():
@@ -19,3 +51,14 @@ def get_session():
     """Dependency to get database session."""
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """
+    Dependency to get an async database session.
+
+    Use from ``async def`` routes so queries await the driver instead of
+    blocking the event loop.
+    """
+    async with AsyncSession(async_engine) as session:
+        yield session
@@ -3,9 +3,13 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import settings
 from app.database import create_db_and_tables
-from app.routers import tasks, ai
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.routers import tasks, ai, changes
+from app.services.changes import change_feed
+from app.services.suggestions import suggestion_refresher
 
 
 @asynccontextmanager
@@ -13,8 +17,12 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup: create database tables
     create_db_and_tables()
+    suggestion_refresher.start()
+    await change_feed.start()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop background work
+    await change_feed.stop()
+    await suggestion_refresher.stop()
 
 
 app = FastAPI(
@@ -38,8 +46,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency includes CORS handling
+app.add_middleware(MetricsMiddleware)
+
 # Include routers - AI router first to ensure specific routes match before /{task_id}
 app.include_router(ai.router)
+app.include_router(changes.router)
 app.include_router(tasks.router)
 
 
@@ -53,3 +65,9 @@ def root():
 def health():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics for this worker."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
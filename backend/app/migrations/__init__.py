@@ -0,0 +1,22 @@
+"""Versioned database migrations.
+
+Each module in ``app.migrations.versions`` named ``vNNNN_<name>.py``
+defines ``up(conn)`` and ``down(conn)``. Applied versions are recorded in
+the ``schema_migrations`` table. Run ``python -m app.migrations --help``.
+"""
+
+from app.migrations.runner import (
+    Migration,
+    applied_versions,
+    downgrade,
+    load_migrations,
+    upgrade,
+)
+
+__all__ = [
+    "Migration",
+    "applied_versions",
+    "downgrade",
+    "load_migrations",
+    "upgrade",
+]
@@ -0,0 +1,39 @@
+"""Command-line entry point: ``python -m app.migrations``."""
+
+import argparse
+
+from app.database import engine
+from app.migrations.runner import (
+    applied_versions,
+    downgrade,
+    load_migrations,
+    upgrade,
+)
+
+
+def main() -> None:
+    """Run the requested migration command against the configured database."""
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    up = commands.add_parser("upgrade", help="apply pending migrations")
+    up.add_argument("target", nargs="?", type=int, help="stop at this version")
+    down = commands.add_parser("downgrade", help="roll back migrations")
+    down.add_argument("target", type=int, help="roll back to this version (0 = all)")
+    commands.add_parser("status", help="list migrations and whether they are applied")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        done = upgrade(engine, args.target)
+        print(f"Applied: {done}" if done else "Already up to date")
+    elif args.command == "downgrade":
+        done = downgrade(engine, args.target)
+        print(f"Rolled back: {done}" if done else "Nothing to roll back")
+    else:
+        applied = set(applied_versions(engine))
+        for migration in load_migrations():
+            mark = "x" if migration.version in applied else " "
+            print(f"[{mark}] {migration.version:04d} {migration.name}")
+
+
+if __name__ == "__main__":
+    main()
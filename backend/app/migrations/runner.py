@@ -0,0 +1,129 @@
+"""Discover, apply and roll back versioned migrations."""
+
+import importlib
+import pkgutil
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    insert,
+    select,
+)
+
+from app.migrations import versions
+
+VERSION_TABLE = "schema_migrations"
+_MODULE_NAME = re.compile(r"v(\d{4})_(\w+)")
+
+_metadata = MetaData()
+schema_migrations = Table(
+    VERSION_TABLE,
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single schema change with its inverse."""
+
+    version: int
+    name: str
+    up: Callable[[Connection], None]
+    down: Callable[[Connection], None]
+
+
+def load_migrations() -> list[Migration]:
+    """Return all migrations in ``app.migrations.versions``, oldest first."""
+    migrations = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        match = _MODULE_NAME.fullmatch(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migrations.append(
+            Migration(int(match[1]), match[2], module.up, module.down)
+        )
+
+    migrations.sort(key=lambda m: m.version)
+    seen = [m.version for m in migrations]
+    if len(seen) != len(set(seen)):
+        raise RuntimeError(f"Duplicate migration versions: {seen}")
+    return migrations
+
+
+def applied_versions(engine: Engine) -> list[int]:
+    """Return the versions recorded as applied, creating the table if needed."""
+    _metadata.create_all(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(schema_migrations.c.version).order_by(schema_migrations.c.version)
+        )
+        return [row.version for row in rows]
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> list[int]:
+    """
+    Apply pending migrations up to ``target`` (default: latest).
+
+    Each migration runs in its own transaction together with the row that
+    records it, so a failure leaves the database at the last good version.
+
+    Returns:
+        Versions applied, in order.
+    """
+    applied = set(applied_versions(engine))
+    done = []
+    for migration in load_migrations():
+        if migration.version in applied:
+            continue
+        if target is not None and migration.version > target:
+            break
+        with engine.begin() as conn:
+            migration.up(conn)
+            conn.execute(
+                insert(schema_migrations).values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        done.append(migration.version)
+    return done
+
+
+def downgrade(engine: Engine, target: int) -> list[int]:
+    """
+    Roll back applied migrations newer than ``target``, newest first.
+
+    Returns:
+        Versions rolled back, in order.
+    """
+    applied = set(applied_versions(engine))
+    done = []
+    for migration in reversed(load_migrations()):
+        if migration.version <= target or migration.version not in applied:
+            continue
+        with engine.begin() as conn:
+            migration.down(conn)
+            conn.execute(
+                delete(schema_migrations).where(
+                    schema_migrations.c.version == migration.version
+                )
+            )
+        done.append(migration.version)
+    return done
@@ -0,0 +1,35 @@
+"""Add the Phase III due_date, priority and categories columns."""
+
+from sqlalchemy import Connection, inspect, text
+
+COLUMNS = {
+    "due_date": "TIMESTAMP",
+    "priority": "VARCHAR(10)",
+    "categories": "JSON",
+}
+
+
+def _existing_columns(conn: Connection) -> set[str]:
+    inspector = inspect(conn)
+    if not inspector.has_table("tasks"):
+        # Fresh database: app startup creates the current schema.
+        return set(COLUMNS)
+    return {column["name"] for column in inspector.get_columns("tasks")}
+
+
+def up(conn: Connection) -> None:
+    """Add the columns that are missing (tables from create_all have them)."""
+    existing = _existing_columns(conn)
+    for name, sql_type in COLUMNS.items():
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE tasks ADD COLUMN {name} {sql_type}"))
+
+
+def down(conn: Connection) -> None:
+    """Drop the Phase III columns."""
+    if not inspect(conn).has_table("tasks"):
+        return
+    existing = _existing_columns(conn)
+    for name in reversed(COLUMNS):
+        if name in existing:
+            conn.execute(text(f"ALTER TABLE tasks DROP COLUMN {name}"))
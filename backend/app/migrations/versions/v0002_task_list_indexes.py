@@ -0,0 +1,27 @@
+"""Composite and partial indexes for the task list and overdue queries."""
+
+from sqlalchemy import Connection, inspect, text
+
+INDEXES = {
+    # GET /api/tasks?status=...: filter on user + status, newest first.
+    "ix_tasks_user_completed_created":
+        "ON tasks (user_id, completed, created_at)",
+    # GET /api/tasks (all statuses): newest first, id breaks ties.
+    "ix_tasks_user_created": "ON tasks (user_id, created_at, id)",
+    # Overdue/upcoming lookups only ever look at open tasks.
+    "ix_tasks_user_due_pending": "ON tasks (user_id, due_date) WHERE NOT completed",
+}
+
+
+def up(conn: Connection) -> None:
+    """Create the indexes."""
+    if not inspect(conn).has_table("tasks"):
+        return
+    for name, definition in INDEXES.items():
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} {definition}"))
+
+
+def down(conn: Connection) -> None:
+    """Drop the indexes."""
+    for name in INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
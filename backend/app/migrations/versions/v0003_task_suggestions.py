@@ -0,0 +1,22 @@
+"""Table of precomputed AI suggestions, one row per user."""
+
+from sqlalchemy import JSON, Column, Connection, DateTime, MetaData, String, Table
+
+_metadata = MetaData()
+task_suggestions = Table(
+    "task_suggestions",
+    _metadata,
+    Column("user_id", String, primary_key=True),
+    Column("suggestions", JSON),
+    Column("generated_at", DateTime, nullable=False),
+)
+
+
+def up(conn: Connection) -> None:
+    """Create the table."""
+    task_suggestions.create(conn, checkfirst=True)
+
+
+def down(conn: Connection) -> None:
+    """Drop the table."""
+    task_suggestions.drop(conn, checkfirst=True)
@@ -0,0 +1,18 @@
+"""Index behind the task list ETag query."""
+
+from sqlalchemy import Connection, inspect, text
+
+
+def up(conn: Connection) -> None:
+    """Create the index."""
+    if not inspect(conn).has_table("tasks"):
+        return
+    # count(*) and max(updated_at) per user, answered from the index alone.
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_updated ON tasks (user_id, updated_at)"
+    ))
+
+
+def down(conn: Connection) -> None:
+    """Drop the index."""
+    conn.execute(text("DROP INDEX IF EXISTS ix_tasks_user_updated"))
@@ -0,0 +1,66 @@
+"""Normalized task_categories table, backfilled from tasks.categories."""
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    Connection,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+    insert,
+    select,
+)
+
+from app.services.task_categories import normalize_categories
+
+BATCH_SIZE = 1000
+
+_metadata = MetaData()
+# Only the columns the backfill reads; the real table already exists.
+tasks = Table(
+    "tasks",
+    _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", String),
+    Column("categories", JSON),
+)
+task_categories = Table(
+    "task_categories",
+    _metadata,
+    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True),
+    Column("category", String, primary_key=True),
+    Column("user_id", String, nullable=False),
+    Index("ix_task_categories_user_category", "user_id", "category", "task_id"),
+)
+
+
+def up(conn: Connection) -> None:
+    """Create the table and copy each task's JSON categories into it."""
+    if not inspect(conn).has_table("tasks"):
+        return
+    # The app's create_all may already have made the table, empty.
+    task_categories.create(conn, checkfirst=True)
+
+    copied = select(task_categories.c.task_id).where(task_categories.c.task_id == tasks.c.id)
+    rows = conn.execute(
+        select(tasks.c.id, tasks.c.user_id, tasks.c.categories).where(
+            tasks.c.categories.is_not(None), ~copied.exists()
+        )
+    )
+    while batch := rows.fetchmany(BATCH_SIZE):
+        values = [
+            {"task_id": task_id, "category": category, "user_id": user_id}
+            for task_id, user_id, categories in batch
+            for category in normalize_categories(categories)
+        ]
+        if values:
+            conn.execute(insert(task_categories), values)
+
+
+def down(conn: Connection) -> None:
+    """Drop the table; the JSON column still holds every category."""
+    task_categories.drop(conn, checkfirst=True)
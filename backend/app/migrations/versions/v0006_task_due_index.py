@@ -0,0 +1,19 @@
+"""Index behind due-date filters and the calendar counts."""
+
+from sqlalchemy import Connection, inspect, text
+
+
+def up(conn: Connection) -> None:
+    """Create the index."""
+    if not inspect(conn).has_table("tasks"):
+        return
+    # Per-day counts of all tasks, open or done, from the index alone;
+    # ix_tasks_user_due_pending covers only open tasks.
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_due ON tasks (user_id, due_date, completed)"
+    ))
+
+
+def down(conn: Connection) -> None:
+    """Drop the index."""
+    conn.execute(text("DROP INDEX IF EXISTS ix_tasks_user_due"))
@@ -3,13 +3,33 @@
 from datetime import datetime, timezone
 from typing import Optional
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index, text
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time as the naive datetime timestamp columns hold."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class Task(SQLModel, table=True):
     """Task database model."""
 
     __tablename__ = "tasks"
+    # Keep in sync with app/migrations/versions; create_all uses these for
+    # fresh databases, migrations add them to existing ones.
+    __table_args__ = (
+        Index("ix_tasks_user_completed_created", "user_id", "completed", "created_at"),
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_updated", "user_id", "updated_at"),
+        Index("ix_tasks_user_due", "user_id", "due_date", "completed"),
+        Index(
+            "ix_tasks_user_due_pending",
+            "user_id",
+            "due_date",
+            postgresql_where=text("NOT completed"),
+            sqlite_where=text("NOT completed"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(index=True)
@@ -19,5 +39,34 @@ class Task(SQLModel, table=True):
     due_date: Optional[datetime] = Field(default=None)
     priority: Optional[str] = Field(default=None)  # "low", "medium", "high"
     categories: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
+
+
+class TaskCategory(SQLModel, table=True):
+    """
+    One category of a task, normalized out of ``Task.categories``.
+
+    ``Task.categories`` stays the copy returned by the API; these rows,
+    written in the same transaction, back category filters and facet
+    counts with an index instead of a scan over JSON.
+    """
+
+    __tablename__ = "task_categories"
+    __table_args__ = (
+        Index("ix_task_categories_user_category", "user_id", "category", "task_id"),
+    )
+
+    task_id: int = Field(foreign_key="tasks.id", primary_key=True)
+    category: str = Field(primary_key=True)
+    user_id: str
+
+
+class SuggestionSet(SQLModel, table=True):
+    """AI task suggestions precomputed for one user."""
+
+    __tablename__ = "task_suggestions"
+
+    user_id: str = Field(primary_key=True)
+    suggestions: list[dict] = Field(default_factory=list, sa_column=Column(JSON))
+    generated_at: datetime = Field(default_factory=utc_now)
@@ -1,24 +1,64 @@
 """AI-powered task endpoints."""
 
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlalchemy import and_, case, func, not_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.database import get_session
+from app.database import get_async_session
 from app.auth import verify_token
-from app.models import Task
+from app.models import SuggestionSet, Task, utc_now
 from app.schemas import (
+    AICacheStats,
+    BatchCategorizeRequest,
+    BatchCategorizeResponse,
     NaturalLanguageInput,
     ParsedTaskResponse,
     SuggestionsResponse,
     CategorizeResponse,
     SummaryResponse,
+    SummaryStats,
+    TaskCategories,
+    TaskResponse,
 )
 from app.services.ai_service import ai_service
+from app.services.changes import change_feed, task_upserted
+from app.services.task_cache import task_cache
+from app.services.task_categories import set_categories
+from app.services.suggestions import (
+    load_suggestion_context,
+    store_suggestions,
+    suggestion_refresher,
+)
 
 router = APIRouter(prefix="/api/tasks", tags=["ai"])
 
+# Open tasks included in the daily summary prompt
+SUMMARY_TASK_LIMIT = 10
+# Overdue counts go stale with the clock, so stats are cached only briefly.
+STATS_CACHE_TTL = 60
+
+
+async def end_read(session: AsyncSession) -> None:
+    """
+    End the session's read transaction before a model call.
+
+    A model call can take up to ``AI_TIMEOUT_SECONDS``; holding a pooled
+    connection through it would let a few slow requests drain the pool.
+    The session checks out a connection again when it is next used.
+    """
+    await session.commit()
 
-@router.post("/parse", response_model=ParsedTaskResponse)
+
+def require_ai() -> None:
+    """Dependency that rejects model-backed requests while AI is off."""
+    if not ai_service.enabled:
+        raise HTTPException(status_code=503, detail="AI features are not configured")
+
+
+@router.post("/parse", response_model=ParsedTaskResponse, dependencies=[Depends(require_ai)])
 async def parse_natural_language(
     input_data: NaturalLanguageInput,
     user_id: str = Depends(verify_token),
@@ -27,78 +67,224 @@ async def parse_natural_language(
     try:
         parsed = await ai_service.parse_task(input_data.text)
         return parsed
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="AI request timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI parsing failed: {str(e)}")
 
 
-@router.get("/suggestions", response_model=SuggestionsResponse)
+@router.get(
+    "/suggestions",
+    response_model=SuggestionsResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(require_ai)],
+)
 async def get_suggestions(
     user_id: str = Depends(verify_token),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    """Get AI-generated task suggestions based on existing tasks."""
+    """
+    Get AI-generated task suggestions based on existing tasks.
+
+    With the background refresher enabled, precomputed suggestions are
+    returned without a model call; they are generated on the spot only
+    for a user who has none stored yet.
+    """
+    if suggestion_refresher.enabled:
+        stored = await session.get(SuggestionSet, user_id)
+        if stored is not None:
+            return SuggestionsResponse(
+                suggestions=stored.suggestions, generated_at=stored.generated_at
+            )
+
+    context = await load_suggestion_context(session, user_id)
+    await end_read(session)
     try:
-        statement = select(Task).where(Task.user_id == user_id)
-        tasks = session.exec(statement).all()
-
-        tasks_data = [
-            {
-                "title": t.title,
-                "completed": t.completed,
-                "priority": t.priority,
-                "due_date": t.due_date.isoformat() if t.due_date else None,
-                "categories": t.categories,
-            }
-            for t in tasks
-        ]
-
-        suggestions = await ai_service.get_suggestions(tasks_data)
-        return SuggestionsResponse(suggestions=suggestions)
+        suggestions = await ai_service.get_suggestions(context)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="AI request timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI suggestions failed: {str(e)}")
 
+    if not suggestion_refresher.enabled:
+        return SuggestionsResponse(suggestions=suggestions)
+    stored = await store_suggestions(session, user_id, suggestions)
+    return SuggestionsResponse(suggestions=suggestions, generated_at=stored.generated_at)
+
+
+@router.post(
+    "/categorize", response_model=BatchCategorizeResponse, dependencies=[Depends(require_ai)]
+)
+async def categorize_tasks(
+    request: BatchCategorizeRequest,
+    user_id: str = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Auto-categorize many tasks, optionally saving the categories."""
+    task_ids = list(dict.fromkeys(request.task_ids))
+    statement = select(Task.id, Task.title, Task.description).where(
+        Task.user_id == user_id, Task.id.in_(task_ids)
+    )
+    rows = {row.id: row for row in (await session.exec(statement)).all()}
+    await end_read(session)
+
+    try:
+        categories, failed = await ai_service.categorize_tasks(
+            [(row.id, row.title, row.description) for row in rows.values()]
+        )
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="AI request timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI categorization failed: {str(e)}")
+
+    results = [
+        TaskCategories(task_id=task_id, categories=categories[task_id])
+        for task_id in task_ids
+        if task_id in categories
+    ]
+    not_found = [task_id for task_id in task_ids if task_id not in rows]
+    if request.apply and results:
+        # Tasks may have been deleted while the model ran; lock the rest.
+        still_owned = set((await session.exec(
+            select(Task.id)
+            .where(Task.user_id == user_id, Task.id.in_([r.task_id for r in results]))
+            .with_for_update()
+        )).all())
+        not_found += [r.task_id for r in results if r.task_id not in still_owned]
+        results = [r for r in results if r.task_id in still_owned]
+    if request.apply and results:
+        now = utc_now()
+        await session.exec(
+            update(Task),
+            params=[
+                {"id": r.task_id, "categories": r.categories, "updated_at": now}
+                for r in results
+            ],
+        )
+        updated = (await session.exec(
+            select(Task)
+            .where(Task.user_id == user_id, Task.id.in_([r.task_id for r in results]))
+            .execution_options(populate_existing=True)
+        )).all()
+        events = [task_upserted(TaskResponse.model_validate(t)) for t in updated]
+
+        def stage(sync_session):
+            set_categories(sync_session, user_id, {r.task_id: r.categories for r in results})
+            change_feed.stage(sync_session, user_id, events)
+
+        await session.run_sync(stage)
+        await session.commit()
+        task_cache.invalidate(user_id)
 
-@router.post("/{task_id}/categorize", response_model=CategorizeResponse)
+    return BatchCategorizeResponse(
+        results=results,
+        not_found=not_found,
+        failed=failed,
+        applied=request.apply and bool(results),
+    )
+
+
+@router.post(
+    "/{task_id}/categorize", response_model=CategorizeResponse, dependencies=[Depends(require_ai)]
+)
 async def categorize_task(
     task_id: int,
     user_id: str = Depends(verify_token),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Auto-categorize a task using AI."""
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
 
     if not task or task.user_id != user_id:
         raise HTTPException(status_code=404, detail="Task not found")
+    title, description = task.title, task.description
+    await end_read(session)
 
     try:
-        categories = await ai_service.categorize_task(task.title, task.description)
+        categories = await ai_service.categorize_task(title, description)
         return CategorizeResponse(categories=categories)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="AI request timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI categorization failed: {str(e)}")
 
 
-@router.get("/summary", response_model=SummaryResponse)
+async def summary_stats(session: AsyncSession, user_id: str) -> SummaryStats:
+    """
+    Count a user's tasks by status in one aggregate query.
+
+    Results are cached briefly: the overdue count also changes as time
+    passes, not only when the user writes.
+    """
+    cached, generation = await task_cache.aget(user_id, "stats")
+    if cached is not None:
+        return SummaryStats(**cached)
+
+    pending = not_(Task.completed)
+    statement = select(
+        func.count(),
+        func.count(case((Task.completed, 1))),
+        func.count(case((and_(pending, Task.priority == "high"), 1))),
+        func.count(case((and_(pending, Task.due_date < datetime.now()), 1))),
+    ).where(Task.user_id == user_id)
+    total, completed, high_priority, overdue = (await session.exec(statement)).one()
+    stats = SummaryStats(
+        total=total,
+        completed=completed,
+        high_priority=high_priority,
+        overdue=overdue,
+    )
+    await task_cache.aset(user_id, generation, "stats", stats.model_dump(), ttl=STATS_CACHE_TTL)
+    return stats
+
+
+@router.get("/stats", response_model=SummaryStats)
+async def get_summary_stats(
+    user_id: str = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Get task counts for the summary without calling the AI model."""
+    return await summary_stats(session, user_id)
+
+
+@router.get("/summary", response_model=SummaryResponse, dependencies=[Depends(require_ai)])
 async def get_daily_summary(
     user_id: str = Depends(verify_token),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Get AI-generated daily summary of tasks."""
     try:
-        statement = select(Task).where(Task.user_id == user_id)
-        tasks = session.exec(statement).all()
-
-        tasks_data = [
-            {
-                "title": t.title,
-                "completed": t.completed,
-                "priority": t.priority,
-                "due_date": t.due_date.isoformat() if t.due_date else None,
-                "categories": t.categories,
-            }
-            for t in tasks
-        ]
-
-        summary, stats = await ai_service.generate_summary(tasks_data)
+        stats = await summary_stats(session, user_id)
+
+        # Only a handful of open tasks go into the prompt; soonest due first.
+        incomplete_tasks, generation = await task_cache.aget(user_id, "summary-tasks")
+        if incomplete_tasks is None:
+            statement = (
+                select(Task.title, Task.priority, Task.due_date)
+                .where(Task.user_id == user_id, not_(Task.completed))
+                .order_by(Task.due_date.is_(None), Task.due_date, Task.id)
+                .limit(SUMMARY_TASK_LIMIT)
+            )
+            incomplete_tasks = [
+                {
+                    "title": t.title,
+                    "priority": t.priority,
+                    "due_date": t.due_date.isoformat() if t.due_date else None,
+                }
+                for t in (await session.exec(statement)).all()
+            ]
+            await task_cache.aset(user_id, generation, "summary-tasks", incomplete_tasks)
+        await end_read(session)
+
+        summary = await ai_service.generate_summary(stats, incomplete_tasks)
         return SummaryResponse(summary=summary, stats=stats)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="AI request timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI summary failed: {str(e)}")
+
+
+@router.get("/cache-stats", response_model=AICacheStats)
+async def get_cache_stats(user_id: str = Depends(verify_token)):
+    """Get hit/miss counters for the AI response cache on this worker."""
+    return AICacheStats(**ai_service.cache.stats())
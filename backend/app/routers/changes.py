@@ -0,0 +1,80 @@
+"""Server-Sent Events stream of task changes."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+
+from app.auth import verify_token
+from app.services.changes import RESET, ChangeBroker, change_feed
+
+router = APIRouter(prefix="/api/tasks", tags=["changes"])
+
+# Comment lines keep idle connections open through proxies.
+KEEPALIVE_SECONDS = 15.0
+
+
+def format_event(event: dict[str, Any]) -> str:
+    """Render one change as an SSE message."""
+    if event["type"] == "reset":
+        return f"id: {event['id']}\nevent: reset\ndata: {{}}\n\n"
+    return f"id: {event['id']}\nevent: change\ndata: {json.dumps(event)}\n\n"
+
+
+async def event_stream(
+    broker: ChangeBroker,
+    user_id: str,
+    cursor: Optional[str] = None,
+    keepalive: float = KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for a user's changes until the client disconnects.
+
+    Starts with a ``reset`` message if the client's cursor could not be
+    resumed, or a ``ready`` message otherwise, then replays the backlog
+    and streams live changes. The subscription is made on the first
+    iteration, so a client that leaves before the stream starts leaves
+    nothing registered.
+    """
+    subscription = broker.subscribe(user_id, cursor)
+    try:
+        yield "event: reset\ndata: {}\n\n" if subscription.reset else "event: ready\ndata: {}\n\n"
+        for event in subscription.backlog:
+            yield format_event(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), keepalive)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is RESET:
+                yield "event: reset\ndata: {}\n\n"
+            else:
+                yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/changes")
+async def stream_changes(
+    cursor: Optional[str] = Query(default=None),
+    last_event_id: Optional[str] = Header(default=None),
+    user_id: str = Depends(verify_token),
+):
+    """
+    Stream the user's task changes as Server-Sent Events.
+
+    Each ``change`` event carries an ``upsert`` (with the full task) or a
+    ``delete``. Clients load ``GET /api/tasks`` once, then apply changes;
+    to resume after a disconnect, send the last event ID seen as the
+    ``Last-Event-ID`` header or ``cursor`` parameter. A ``reset`` event
+    means some changes cannot be replayed and the list must be reloaded.
+    """
+    return StreamingResponse(
+        event_stream(change_feed, user_id, last_event_id or cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
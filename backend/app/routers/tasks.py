@@ -1,41 +1,276 @@
 """Task CRUD API endpoints."""
 
-from datetime import datetime, timezone
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import base64
+import binascii
+import hashlib
+from datetime import date, datetime, time, timedelta
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import and_, case, delete, func, not_, or_, update
 from sqlmodel import Session, select
 from app.database import get_session
-from app.models import Task
+from app.models import Task, TaskCategory, utc_now
 from app.schemas import (
+    CalendarDay,
+    CalendarResponse,
+    CategoryCount,
+    CategoryFacets,
     TaskCreate,
     TaskUpdate,
     TaskResponse,
     TaskListItem,
+    TaskListPage,
     TaskCompleteResponse,
+    BulkCreate,
+    BulkDelete,
+    BulkRequest,
+    BulkResponse,
+    BulkResult,
+    BulkToggle,
+    BulkUpdate,
+    TaskCacheStats,
 )
 from app.auth import verify_token
+from app.services.changes import change_feed, task_deleted, task_upserted
+from app.services.suggestions import suggestion_refresher
+from app.services.task_categories import (
+    category_filter,
+    delete_categories,
+    normalize_categories,
+    set_categories,
+)
+from app.services.task_cache import task_cache
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_CALENDAR_DAYS = 366
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    """Encode the sort key of the last task on a page as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+TASK_COLUMNS = tuple(Task.__table__.columns)
+
+# Clients may reuse a cached copy but must revalidate it with If-None-Match.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a weak ETag from the values a response depends on."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against ``etag`` using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
 
-@router.get("", response_model=list[TaskListItem])
+def local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Express a datetime the way due dates are stored: naive, server-local.
+
+    Due dates are compared with the naive ``datetime.now()`` elsewhere, so
+    aware query parameters are converted to local time first.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _task_written(user_id: str) -> None:
+    """Refresh what derives from a user's tasks once a write has committed."""
+    task_cache.invalidate(user_id)
+    suggestion_refresher.mark_dirty(user_id)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def _update_returning(session: Session, statement, task_id: int, columns):
+    """
+    Run an ownership-scoped UPDATE and return the changed row, or None.
+
+    Uses ``UPDATE ... RETURNING`` so the write and the read are one round
+    trip. Backends without RETURNING fall back to the UPDATE followed by a
+    SELECT of the same row.
+    """
+    statement = statement.execution_options(synchronize_session=False)
+    if session.get_bind().dialect.update_returning:
+        return session.exec(statement.returning(*columns)).first()
+    if session.exec(statement).rowcount == 0:
+        return None
+    return session.exec(select(*columns).where(Task.id == task_id)).first()
+
+
+def _missing_task(session: Session, task_id: int, action: str) -> HTTPException:
+    """
+    Explain why an ownership-scoped statement matched no row.
+
+    Only runs on the failure path, to keep the 404/403 distinction.
+    """
+    exists = session.exec(select(Task.id).where(Task.id == task_id)).first()
+    if exists is None:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task #{task_id} not found"
+        )
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Not authorized to {action} this task"
+    )
+
+
+@router.get("", response_model=TaskListPage)
 def list_tasks(
+    response: Response,
     status_filter: Optional[str] = Query(default="all", alias="status"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category: list[str] = Query(default=[]),
+    category_match: Literal["any", "all"] = "any",
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: bool = False,
+    due_within_days: Optional[int] = Query(default=None, ge=0, le=MAX_CALENDAR_DAYS),
+    if_none_match: Optional[str] = Header(default=None),
     user_id: str = Depends(verify_token),
     session: Session = Depends(get_session),
 ):
-    """List all tasks for authenticated user."""
-    query = select(Task).where(Task.user_id == user_id)
+    """
+    List tasks for authenticated user, newest first, one page at a time.
+
+    Pages are keyed on ``(created_at, id)``: pass the previous page's
+    ``next_cursor`` to continue. Each page is a bounded index range scan,
+    so its cost does not depend on how deep into the list it is.
+
+    Repeat ``category`` to keep only tasks in any (``category_match=any``)
+    or all (``category_match=all``) of them; names match case-insensitively.
+
+    Due-date filters combine with each other and with ``status``:
+    ``due_after``/``due_before`` bound ``due_date`` (inclusive/exclusive),
+    ``overdue`` keeps open tasks past their due date and
+    ``due_within_days`` keeps tasks due from now through N days ahead.
+    The relative filters are evaluated to the minute, which is also how
+    long their cached pages and ETags stay valid.
+
+    The weak ETag covers the user's task count and latest ``updated_at``
+    (any create, change or delete moves one of them) plus the query
+    parameters. A matching ``If-None-Match`` gets a 304 after that one
+    aggregate query, without loading any rows. Pages and their ETags are
+    also kept in ``task_cache`` until the user's next write.
+    """
+    categories = normalize_categories(category)
+    due_after, due_before = local_naive(due_after), local_naive(due_before)
+    now = datetime.now().replace(second=0, microsecond=0)
+    relative = overdue or due_within_days is not None
+    filter_key = "|".join(map(str, (
+        f"{category_match}:{','.join(sorted(categories))}" if categories else "",
+        due_after or "",
+        due_before or "",
+        overdue or "",
+        "" if due_within_days is None else due_within_days,
+        now if relative else "",
+    )))
+    shape = f"list:{status_filter}:{limit}:{cursor or ''}:{filter_key}"
+    cached, generation = task_cache.get(user_id, shape)
+    if cached is not None:
+        if etag_matches(if_none_match, cached["etag"]):
+            return not_modified(cached["etag"])
+        response.headers["ETag"] = cached["etag"]
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return cached["page"]
+
+    count, last_updated = session.exec(
+        select(func.count(), func.max(Task.updated_at)).where(Task.user_id == user_id)
+    ).one()
+    etag = make_etag(user_id, count, last_updated, status_filter, limit, cursor, filter_key)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    query = select(
+        Task.id,
+        Task.title,
+        Task.completed,
+        Task.due_date,
+        Task.priority,
+        Task.created_at,
+    ).where(Task.user_id == user_id)
 
     if status_filter == "pending":
         query = query.where(Task.completed.is_(False))  # noqa: E712
     elif status_filter == "completed":
         query = query.where(Task.completed.is_(True))  # noqa: E712
 
-    query = query.order_by(Task.created_at.desc())
-    tasks = session.exec(query).all()
+    if categories:
+        query = query.where(category_filter(user_id, categories, category_match))
+    if due_after is not None:
+        query = query.where(Task.due_date >= due_after)
+    if due_before is not None:
+        query = query.where(Task.due_date < due_before)
+    if overdue:
+        query = query.where(Task.completed.is_(False), Task.due_date < now)
+    if due_within_days is not None:
+        query = query.where(
+            Task.due_date >= now, Task.due_date < now + timedelta(days=due_within_days)
+        )
+
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            or_(
+                Task.created_at < after_created_at,
+                and_(Task.created_at == after_created_at, Task.id < after_id),
+            )
+        )
+
+    query = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+    rows = session.exec(query).all()
 
-    return tasks
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    page = TaskListPage(
+        items=[TaskListItem.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+        limit=limit,
+    )
+    task_cache.set(user_id, generation, shape, {"etag": etag, "page": page.model_dump(mode="json")})
+    return page
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -54,19 +289,264 @@ def create_task(
         categories=task_data.categories,
     )
     session.add(task)
+    session.flush()
+    if task.categories:
+        set_categories(session, user_id, {task.id: task.categories}, replace=False)
+    # Every column is set client-side, so the flushed object is complete;
+    # serializing before commit avoids a refresh SELECT.
+    response = TaskResponse.model_validate(task)
+    change_feed.stage(session, user_id, [task_upserted(response)])
     session.commit()
-    session.refresh(task)
+    _task_written(user_id)
 
-    return task
+    return response
+
+
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_tasks(
+    request: BulkRequest,
+    user_id: str = Depends(verify_token),
+    session: Session = Depends(get_session),
+):
+    """
+    Apply many create/update/delete/toggle operations in one transaction.
+
+    Ownership of every referenced task is checked with one ``IN`` query.
+    Operations on missing or foreign tasks fail individually (404/403) and
+    the rest are applied, grouped into set-based statements: one DELETE,
+    one UPDATE per toggle kind, one executemany UPDATE for field changes
+    and one multi-row INSERT. Each task may appear at most once.
+    """
+    operations = request.operations
+    ids = [op.id for op in operations if not isinstance(op, BulkCreate)]
+    if len(ids) != len(set(ids)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each task may appear in at most one operation"
+        )
+
+    owners: dict[int, str] = {}
+    if ids:
+        owners = dict(session.exec(select(Task.id, Task.user_id).where(Task.id.in_(ids))).all())
+    results: list[Optional[BulkResult]] = [None] * len(operations)
+    for index, op in enumerate(operations):
+        if isinstance(op, BulkCreate) or owners.get(op.id) == user_id:
+            continue
+        if op.id not in owners:
+            results[index] = BulkResult(
+                op=op.op, id=op.id, status=status.HTTP_404_NOT_FOUND,
+                detail=f"Task #{op.id} not found",
+            )
+        else:
+            results[index] = BulkResult(
+                op=op.op, id=op.id, status=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to update this task",
+            )
+    valid = [(i, op) for i, op in enumerate(operations) if results[i] is None]
+
+    def ids_of(kind: type, **match) -> list[int]:
+        return [
+            op.id for _, op in valid
+            if isinstance(op, kind) and all(getattr(op, k) == v for k, v in match.items())
+        ]
+
+    now = utc_now()
+    owned = Task.user_id == user_id
+    no_sync = {"synchronize_session": False}
+
+    deleted = ids_of(BulkDelete)
+    if deleted:
+        delete_categories(session, user_id, deleted)
+        session.exec(
+            delete(Task).where(owned, Task.id.in_(deleted)).execution_options(**no_sync)
+        )
+
+    for completed, value in ((None, not_(Task.completed)), (True, True), (False, False)):
+        toggled = ids_of(BulkToggle, completed=completed)
+        if toggled:
+            session.exec(
+                update(Task)
+                .where(owned, Task.id.in_(toggled))
+                .values(completed=value, updated_at=now)
+                .execution_options(**no_sync)
+            )
+
+    changes = [
+        {"id": op.id, **op.changes.model_dump(exclude_none=True), "updated_at": now}
+        for _, op in valid if isinstance(op, BulkUpdate)
+    ]
+    if changes:
+        session.exec(update(Task), params=changes)
+        set_categories(session, user_id, {
+            change["id"]: change["categories"] for change in changes if "categories" in change
+        })
+
+    created = [
+        Task(user_id=user_id, **op.task.model_dump())
+        for _, op in valid if isinstance(op, BulkCreate)
+    ]
+    session.add_all(created)
+    session.flush()
+    set_categories(
+        session, user_id, {task.id: task.categories for task in created if task.categories},
+        replace=False,
+    )
+
+    changed_ids = [op.id for _, op in valid if isinstance(op, (BulkUpdate, BulkToggle))]
+    tasks = {task.id: task for task in created}
+    if changed_ids:
+        tasks.update(
+            (task.id, task)
+            for task in session.exec(
+                select(Task)
+                .where(Task.id.in_(changed_ids))
+                .execution_options(populate_existing=True)
+            )
+        )
+
+    created_iter = iter(created)
+    events = []
+    for index, op in valid:
+        if isinstance(op, BulkDelete):
+            results[index] = BulkResult(op=op.op, id=op.id, status=status.HTTP_204_NO_CONTENT)
+            events.append(task_deleted(op.id))
+            continue
+        task = next(created_iter) if isinstance(op, BulkCreate) else tasks[op.id]
+        results[index] = BulkResult(
+            op=op.op,
+            id=task.id,
+            status=status.HTTP_201_CREATED if isinstance(op, BulkCreate) else status.HTTP_200_OK,
+            task=TaskResponse.model_validate(task),
+        )
+        events.append(task_upserted(results[index].task))
+
+    if events:
+        change_feed.stage(session, user_id, events)
+    session.commit()
+    if valid:
+        _task_written(user_id)
+
+    return BulkResponse(results=results)
+
+
+@router.get("/task-cache-stats", response_model=TaskCacheStats)
+def get_task_cache_stats(user_id: str = Depends(verify_token)):
+    """Get hit/miss counters for the task read cache on this worker."""
+    return TaskCacheStats(**task_cache.stats())
+
+
+@router.get("/calendar", response_model=CalendarResponse)
+def get_calendar(
+    start: date,
+    end: date,
+    user_id: str = Depends(verify_token),
+    session: Session = Depends(get_session),
+):
+    """
+    Count tasks due on each day from ``start`` through ``end``.
+
+    One ``GROUP BY date(due_date)`` over a range scan of
+    ``ix_tasks_user_due``, which also covers the completed counts.
+    """
+    if end < start or (end - start).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be on or after start and within {MAX_CALENDAR_DAYS} days"
+        )
+
+    shape = f"calendar:{start}:{end}"
+    cached, generation = task_cache.get(user_id, shape)
+    if cached is not None:
+        return cached
+
+    day = func.date(Task.due_date).label("day")
+    rows = session.exec(
+        select(day, func.count(), func.count(case((Task.completed, 1))))
+        .where(
+            Task.user_id == user_id,
+            Task.due_date >= datetime.combine(start, time.min),
+            Task.due_date < datetime.combine(end + timedelta(days=1), time.min),
+        )
+        .group_by(day)
+        .order_by(day)
+    ).all()
+
+    calendar = CalendarResponse(
+        start=start,
+        end=end,
+        days=[CalendarDay(date=d, total=total, completed=done) for d, total, done in rows],
+    )
+    task_cache.set(user_id, generation, shape, calendar.model_dump(mode="json"))
+    return calendar
+
+
+@router.get("/categories", response_model=CategoryFacets)
+def list_categories(
+    status_filter: Optional[str] = Query(default="all", alias="status"),
+    user_id: str = Depends(verify_token),
+    session: Session = Depends(get_session),
+):
+    """
+    Count the user's tasks per category, largest first.
+
+    Counts come from ``task_categories`` alone unless ``status`` narrows
+    them to pending or completed tasks.
+    """
+    shape = f"categories:{status_filter}"
+    cached, generation = task_cache.get(user_id, shape)
+    if cached is not None:
+        return cached
+
+    count = func.count().label("count")
+    query = select(TaskCategory.category, count).where(TaskCategory.user_id == user_id)
+    if status_filter in ("pending", "completed"):
+        query = query.join(Task, Task.id == TaskCategory.task_id).where(
+            Task.completed.is_(status_filter == "completed")
+        )
+    rows = session.exec(
+        query.group_by(TaskCategory.category).order_by(count.desc(), TaskCategory.category)
+    ).all()
+
+    facets = CategoryFacets(
+        categories=[CategoryCount(category=row.category, count=row.count) for row in rows]
+    )
+    task_cache.set(user_id, generation, shape, facets.model_dump(mode="json"))
+    return facets
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task(
     task_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     user_id: str = Depends(verify_token),
     session: Session = Depends(get_session),
 ):
-    """Get task details."""
+    """
+    Get task details.
+
+    The weak ETag is derived from the task's ``id`` and ``updated_at``;
+    a matching ``If-None-Match`` is answered with 304 after reading only
+    those two columns, or from ``task_cache`` without a query.
+    """
+    shape = f"task:{task_id}"
+    cached, generation = task_cache.get(user_id, shape)
+    if cached is not None:
+        if etag_matches(if_none_match, cached["etag"]):
+            return not_modified(cached["etag"])
+        response.headers["ETag"] = cached["etag"]
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return cached["task"]
+
+    if if_none_match:
+        row = session.exec(
+            select(Task.user_id, Task.updated_at).where(Task.id == task_id)
+        ).first()
+        if row is not None and row.user_id == user_id:
+            etag = make_etag(task_id, row.updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
     task = session.get(Task, task_id)
 
     if not task:
@@ -81,6 +561,12 @@ def get_task(
             detail="Not authorized to access this task"
         )
 
+    etag = make_etag(task_id, task.updated_at)
+    task_cache.set(user_id, generation, shape, {
+        "etag": etag, "task": TaskResponse.model_validate(task).model_dump(mode="json"),
+    })
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return task
 
 
@@ -92,35 +578,22 @@ def update_task(
     session: Session = Depends(get_session),
 ):
     """Update a task."""
-    task = session.get(Task, task_id)
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task #{task_id} not found"
-        )
-
-    if task.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this task"
-        )
-
-    if task_data.title is not None:
-        task.title = task_data.title
-    if task_data.description is not None:
-        task.description = task_data.description
-    if task_data.due_date is not None:
-        task.due_date = task_data.due_date
-    if task_data.priority is not None:
-        task.priority = task_data.priority
-    if task_data.categories is not None:
-        task.categories = task_data.categories
-
-    task.updated_at = datetime.now(timezone.utc)
-    session.add(task)
+    changes = task_data.model_dump(exclude_none=True)
+    changes["updated_at"] = utc_now()
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(**changes)
+    )
+    row = _update_returning(session, statement, task_id, TASK_COLUMNS)
+    if row is None:
+        raise _missing_task(session, task_id, "update")
+    if "categories" in changes:
+        set_categories(session, user_id, {task_id: changes["categories"]})
+    task = TaskResponse.model_validate(row)
+    change_feed.stage(session, user_id, [task_upserted(task)])
     session.commit()
-    session.refresh(task)
+    _task_written(user_id)
 
     return task
 
@@ -132,22 +605,17 @@ def delete_task(
     session: Session = Depends(get_session),
 ):
     """Delete a task."""
-    task = session.get(Task, task_id)
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task #{task_id} not found"
-        )
-
-    if task.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this task"
-        )
-
-    session.delete(task)
+    delete_categories(session, user_id, [task_id])
+    result = session.exec(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise _missing_task(session, task_id, "delete")
+    change_feed.stage(session, user_id, [task_deleted(task_id)])
     session.commit()
+    _task_written(user_id)
 
 
 @router.patch("/{task_id}/complete", response_model=TaskCompleteResponse)
@@ -157,23 +625,17 @@ def toggle_complete(
     session: Session = Depends(get_session),
 ):
     """Toggle task completion status."""
-    task = session.get(Task, task_id)
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task #{task_id} not found"
-        )
-
-    if task.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this task"
-        )
-
-    task.completed = not task.completed
-    task.updated_at = datetime.now(timezone.utc)
-    session.add(task)
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(completed=not_(Task.completed), updated_at=utc_now())
+    )
+    # The full row feeds the change event; the response needs only two columns.
+    row = _update_returning(session, statement, task_id, TASK_COLUMNS)
+    if row is None:
+        raise _missing_task(session, task_id, "update")
+    change_feed.stage(session, user_id, [task_upserted(TaskResponse.model_validate(row))])
     session.commit()
+    _task_written(user_id)
 
-    return TaskCompleteResponse(id=task.id, completed=task.completed)
+    return TaskCompleteResponse(id=row.id, completed=row.completed)
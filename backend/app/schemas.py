@@ -1,7 +1,7 @@
 """Pydantic schemas for request/response validation."""
 
-from datetime import datetime
-from typing import Optional, Literal
+from datetime import date, datetime
+from typing import Annotated, Optional, Literal, Union
 from pydantic import BaseModel, ConfigDict, Field
 
 
@@ -55,6 +55,14 @@ class TaskListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskListPage(BaseModel):
+    """Schema for one page of the task list."""
+
+    items: list[TaskListItem]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
 class TaskCompleteResponse(BaseModel):
     """Schema for toggle complete response."""
 
@@ -62,6 +70,92 @@ class TaskCompleteResponse(BaseModel):
     completed: bool
 
 
+class CalendarDay(BaseModel):
+    """Schema for the tasks due on one day."""
+
+    date: date
+    total: int
+    completed: int
+
+
+class CalendarResponse(BaseModel):
+    """Schema for per-day due task counts; days without tasks are omitted."""
+
+    start: date
+    end: date
+    days: list[CalendarDay]
+
+
+class CategoryCount(BaseModel):
+    """Schema for the number of tasks in one category."""
+
+    category: str
+    count: int
+
+
+class CategoryFacets(BaseModel):
+    """Schema for a user's categories with task counts, largest first."""
+
+    categories: list[CategoryCount]
+
+
+class BulkCreate(BaseModel):
+    """Bulk operation that creates a task."""
+
+    op: Literal["create"]
+    task: TaskCreate
+
+
+class BulkUpdate(BaseModel):
+    """Bulk operation that updates a task's fields."""
+
+    op: Literal["update"]
+    id: int
+    changes: TaskUpdate
+
+
+class BulkDelete(BaseModel):
+    """Bulk operation that deletes a task."""
+
+    op: Literal["delete"]
+    id: int
+
+
+class BulkToggle(BaseModel):
+    """Bulk operation that flips a task's completion, or sets it if given."""
+
+    op: Literal["toggle"]
+    id: int
+    completed: Optional[bool] = None
+
+
+BulkOperation = Annotated[
+    Union[BulkCreate, BulkUpdate, BulkDelete, BulkToggle], Field(discriminator="op")
+]
+
+
+class BulkRequest(BaseModel):
+    """Schema for a batch of task operations applied in one transaction."""
+
+    operations: list[BulkOperation] = Field(min_length=1, max_length=500)
+
+
+class BulkResult(BaseModel):
+    """Outcome of one bulk operation, in request order."""
+
+    op: str
+    id: Optional[int]
+    status: int  # HTTP status the single-task endpoint would have returned
+    task: Optional[TaskResponse] = None
+    detail: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    """Schema for bulk operation results."""
+
+    results: list[BulkResult]
+
+
 class ErrorResponse(BaseModel):
     """Schema for error response."""
 
@@ -97,6 +191,7 @@ class SuggestionsResponse(BaseModel):
     """Schema for task suggestions response."""
 
     suggestions: list[TaskSuggestion]
+    generated_at: Optional[datetime] = None  # Set when served precomputed
 
 
 class CategorizeResponse(BaseModel):
@@ -105,6 +200,29 @@ class CategorizeResponse(BaseModel):
     categories: list[str]
 
 
+class BatchCategorizeRequest(BaseModel):
+    """Schema for categorizing many tasks at once."""
+
+    task_ids: list[int] = Field(min_length=1, max_length=1000)
+    apply: bool = False  # Save the categories on the tasks
+
+
+class TaskCategories(BaseModel):
+    """Categories chosen for one task."""
+
+    task_id: int
+    categories: list[str]
+
+
+class BatchCategorizeResponse(BaseModel):
+    """Schema for batch categorization response."""
+
+    results: list[TaskCategories]
+    not_found: list[int]
+    failed: list[int]
+    applied: bool
+
+
 class SummaryStats(BaseModel):
     """Schema for summary statistics."""
 
@@ -119,3 +237,23 @@ class SummaryResponse(BaseModel):
 
     summary: str
     stats: SummaryStats
+
+
+class TaskCacheStats(BaseModel):
+    """Schema for task read cache counters."""
+
+    enabled: bool
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: Optional[int]
+
+
+class AICacheStats(BaseModel):
+    """Schema for AI response cache counters."""
+
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    hit_rate: float
+    entries: int
@@ -0,0 +1,160 @@
+"""Pluggable text-generation backends for the AI service."""
+
+import asyncio
+import json
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from app.config import settings
+
+
+class AIBackend(ABC):
+    """A model that turns a prompt into text."""
+
+    #: Model identifier, used in logs and cache keys.
+    name: str
+
+    @abstractmethod
+    async def generate(self, prompt: str) -> str:
+        """Return the model's text response to ``prompt``."""
+
+
+class GeminiBackend(AIBackend):
+    """
+    Google Gemini through the SDK's native async API.
+
+    The SDK takes longer to import than the rest of the app, so it is
+    imported and the model built on the first call, in a worker thread,
+    rather than on every cold start.
+    """
+
+    def __init__(self, api_key: str, model_name: str = "gemini-2.5-flash"):
+        self.api_key = api_key
+        self.name = model_name
+        self._model: Optional[Any] = None
+
+    def _load_model(self) -> Any:
+        import google.generativeai as genai
+
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(self.name)
+
+    async def generate(self, prompt: str) -> str:
+        if self._model is None:
+            self._model = await asyncio.to_thread(self._load_model)
+        response = await self._model.generate_content_async(prompt)
+        return response.text
+
+
+# Keyword -> category table shared by the fake backend's responses.
+FAKE_CATEGORIES = {
+    "work": ("report", "meeting", "email", "client", "deploy", "review"),
+    "shopping": ("buy", "milk", "grocer", "order"),
+    "health": ("doctor", "gym", "run", "dentist", "workout"),
+    "finance": ("pay", "bill", "invoice", "tax", "bank"),
+    "home": ("clean", "laundry", "fix", "repair", "garden"),
+    "social": ("call", "birthday", "party", "dinner"),
+    "learning": ("read", "study", "course", "learn"),
+    "travel": ("flight", "hotel", "trip", "pack"),
+}
+
+
+def fake_categories(text: str) -> list[str]:
+    """Pick up to three categories for ``text`` by keyword."""
+    lowered = text.lower()
+    found = [
+        category
+        for category, keywords in FAKE_CATEGORIES.items()
+        if any(keyword in lowered for keyword in keywords)
+    ]
+    return found[:3] or ["personal"]
+
+
+class FakeBackend(AIBackend):
+    """
+    Deterministic offline stand-in for a real model.
+
+    Recognizes the AIService prompts and answers them from keywords, so
+    the same prompt always yields the same response. ``latency`` adds a
+    non-blocking delay per call to mimic network round trips in load tests.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def generate(self, prompt: str) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if prompt.startswith("Parse this task input"):
+            return self._parse(prompt)
+        if prompt.startswith("Based on these existing tasks"):
+            return self._suggest(prompt)
+        if prompt.startswith("Categorize each of these tasks"):
+            tasks = re.findall(r'^(\d+)\. "(.*)"$', prompt, re.MULTILINE)
+            return json.dumps({number: fake_categories(text) for number, text in tasks})
+        if prompt.startswith("Categorize this task"):
+            task = re.search(r'Task: "(.*)"', prompt)
+            return json.dumps(fake_categories(task.group(1) if task else prompt))
+        if prompt.startswith("Generate a brief"):
+            stats = re.search(r"Stats: (.*)", prompt)
+            return (
+                f"Here is where things stand: {stats.group(1) if stats else 'no stats'}. "
+                "Start with your highest-priority task."
+            )
+        raise ValueError("FakeBackend does not recognize this prompt")
+
+    @staticmethod
+    def _parse(prompt: str) -> str:
+        text = re.search(r'Input: "(.*)"', prompt).group(1)
+        today = re.search(r"Today's date is (\d{4}-\d{2}-\d{2})", prompt).group(1)
+        lowered = text.lower()
+
+        priority = None
+        if any(word in lowered for word in ("urgent", "important", "asap")):
+            priority = "high"
+        elif any(word in lowered for word in ("whenever", "someday")):
+            priority = "low"
+
+        due_date = None
+        if "tomorrow" in lowered:
+            day = datetime.fromisoformat(today) + timedelta(days=1)
+            due_date = day.replace(hour=9).isoformat()
+        elif "today" in lowered:
+            due_date = datetime.fromisoformat(today).replace(hour=17).isoformat()
+
+        return json.dumps({
+            "title": text,
+            "description": None,
+            "due_date": due_date,
+            "priority": priority,
+            "categories": fake_categories(text),
+        })
+
+    @staticmethod
+    def _suggest(prompt: str) -> str:
+        titles = re.findall(r"^- (.*?) \(completed: False", prompt, re.MULTILINE)
+        return json.dumps([
+            {"title": f"Follow up on {title}", "reason": "It is still open"}
+            for title in titles[:3]
+        ])
+
+
+def create_backend() -> Optional[AIBackend]:
+    """
+    Build the backend selected by ``AI_BACKEND``.
+
+    Returns None, which turns the AI features off, when Gemini is selected
+    but ``GEMINI_API_KEY`` is not set.
+    """
+    if settings.AI_BACKEND == "fake":
+        return FakeBackend(latency=settings.AI_FAKE_LATENCY_MS / 1000)
+    if settings.AI_BACKEND == "gemini":
+        if not settings.GEMINI_API_KEY:
+            return None
+        return GeminiBackend(settings.GEMINI_API_KEY)
+    raise ValueError(f"Unknown AI_BACKEND: {settings.AI_BACKEND!r}")
@@ -1,24 +1,226 @@
 """AI Service using Google Gemini API."""
 
+import asyncio
 import json
+import time
 from datetime import datetime
-from typing import Optional
-import google.generativeai as genai
+from collections.abc import Callable
+from typing import Any, Optional, TypeVar
 from app.config import settings
+from app.metrics import ai_call_duration
 from app.schemas import ParsedTaskResponse, TaskSuggestion, SummaryStats
+from app.services.ai_backends import AIBackend, create_backend
+from app.services.ai_cache import AICache, cache_key
 
 
-# Configure Gemini
-genai.configure(api_key=settings.GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-2.5-flash")
+COMMON_CATEGORIES = (
+    "Common categories: work, personal, shopping, health, finance, home, "
+    "errands, learning, social, travel"
+)
+# Numbering, quotes and the answer entry each task adds to a batch prompt.
+BATCH_LINE_TOKENS = 12
+
+T = TypeVar("T")
+
+
+def parse_json_response(text: str) -> Any:
+    """Parse a JSON model response, unwrapping a markdown code fence."""
+    result_text = text.strip()
+    if result_text.startswith("```"):
+        result_text = result_text.split("```")[1]
+        if result_text.startswith("json"):
+            result_text = result_text[4:]
+        result_text = result_text.strip()
+    return json.loads(result_text)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace so trivially different inputs share a cache entry."""
+    return " ".join(text.split())
+
+
+def task_text(title: str, description: Optional[str] = None) -> str:
+    """Return the normalized text a task is categorized by."""
+    text = title
+    if description:
+        text += f" - {description}"
+    return normalize_text(text)
+
+
+def categorize_prompt(text: str) -> str:
+    """Build the prompt that categorizes a single task."""
+    return f"""Categorize this task into 1-3 relevant categories.
+
+Task: "{text}"
+
+{COMMON_CATEGORIES}
+
+Return ONLY a JSON array of category strings, e.g., ["work", "urgent"]
+No markdown formatting."""
+
+
+def valid_categories(answer: Any) -> Optional[list[str]]:
+    """Return up to three categories from a model answer, or None if it is malformed."""
+    if isinstance(answer, list) and all(isinstance(c, str) for c in answer):
+        return answer[:3]
+    return None
+
+
+def require_categories(answer: Any) -> list[str]:
+    """Like ``valid_categories``, but raise ValueError for a malformed answer."""
+    categories = valid_categories(answer)
+    if categories is None:
+        raise ValueError("Model did not return a list of categories")
+    return categories
+
+
+def batch_categorize_prompt(texts: list[str]) -> str:
+    """Build the prompt that categorizes a numbered list of tasks."""
+    lines = "\n".join(f'{number}. "{text}"' for number, text in enumerate(texts, start=1))
+    return f"""Categorize each of these tasks into 1-3 relevant categories.
+
+Tasks:
+{lines}
+
+{COMMON_CATEGORIES}
+
+Return ONLY a JSON object mapping each task number to an array of category strings, e.g., {{"1": ["work"], "2": ["shopping", "errands"]}}
+No markdown formatting."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of ``text`` (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def chunk_texts(texts: list[str], token_budget: int, max_items: int) -> list[list[str]]:
+    """
+    Split texts into chunks that each fit one batch prompt.
+
+    A chunk closes when adding the next text would exceed ``token_budget``
+    or ``max_items``. A text over budget on its own still gets a chunk.
+    """
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for text in texts:
+        cost = estimate_tokens(text) + BATCH_LINE_TOKENS
+        if current and (used + cost > token_budget or len(current) >= max_items):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 class AIService:
-    """Service for AI-powered task features."""
+    """
+    Service for AI-powered task features.
+
+    Every model call is awaited on the backend's async API, bounded by a
+    per-call timeout and capped at ``max_concurrency`` in-flight calls per
+    worker so a burst of AI requests cannot exhaust the model quota or
+    pile up unbounded.
+
+    Parse and categorize results depend only on their prompt, so they are
+    cached under a hash of the model name and the normalized prompt (which
+    includes today's date for parsing) and shared across users.
+
+    With no ``backend`` the AI features are off; routes check ``enabled``
+    before calling in.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[AIBackend],
+        timeout: float = settings.AI_TIMEOUT_SECONDS,
+        max_concurrency: int = settings.AI_MAX_CONCURRENCY,
+        cache: Optional[AICache] = None,
+        batch_token_budget: int = settings.AI_BATCH_TOKEN_BUDGET,
+        batch_max_items: int = settings.AI_BATCH_MAX_ITEMS,
+        batch_concurrency: int = settings.AI_BATCH_CONCURRENCY,
+    ):
+        self.backend = backend
+        self.cache = cache or AICache()
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.batch_token_budget = batch_token_budget
+        self.batch_max_items = batch_max_items
+        self.batch_concurrency = batch_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _limiter(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def generate(self, prompt: str) -> str:
+        """
+        Send a prompt to the backend.
+
+        Raises:
+            TimeoutError: If the model does not answer within ``timeout``
+        """
+        async with self._limiter():
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                response = await asyncio.wait_for(
+                    self.backend.generate(prompt), timeout=self.timeout
+                )
+                outcome = "ok"
+                return response
+            except TimeoutError:
+                outcome = "timeout"
+                raise
+            finally:
+                ai_call_duration.observe(
+                    time.perf_counter() - start, self.backend.name, outcome
+                )
+
+    async def generate_json(
+        self,
+        prompt: str,
+        cache: bool = False,
+        validate: Optional[Callable[[Any], T]] = None,
+    ) -> T:
+        """
+        Send a prompt and parse the JSON response, optionally via the cache.
+
+        ``validate`` converts the parsed answer and raises ValueError if it
+        is malformed. Only answers that pass are cached, so one bad answer
+        is retried on the next call instead of being served until it expires.
+        """
+        check = validate or (lambda answer: answer)
+        if not cache:
+            return check(parse_json_response(await self.generate(prompt)))
+
+        key = cache_key(self.backend.name, prompt)
+        result = await self.cache.get(key)
+        if result is not None:
+            try:
+                return check(result)
+            except ValueError:
+                pass  # Stored before it was validated; ask again
+        result = parse_json_response(await self.generate(prompt))
+        checked = check(result)
+        await self.cache.set(key, result)
+        return checked
 
     async def parse_task(self, text: str) -> ParsedTaskResponse:
         """Parse natural language into structured task data."""
         today = datetime.now().strftime("%Y-%m-%d")
+        text = normalize_text(text)
 
         prompt = f"""Parse this task input into structured data. Today's date is {today}.
 
@@ -43,25 +245,18 @@ Priority keywords: urgent/important/asap = high, normal = medium, whenever/somed
 
 Return only the JSON object, no markdown formatting."""
 
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        # Clean up response if wrapped in markdown
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-            result_text = result_text.strip()
-
-        parsed = json.loads(result_text)
+        def to_response(parsed: Any) -> ParsedTaskResponse:
+            if not isinstance(parsed, dict):
+                raise ValueError("Model did not return a JSON object")
+            return ParsedTaskResponse(
+                title=parsed.get("title", text),
+                description=parsed.get("description"),
+                due_date=parsed.get("due_date"),
+                priority=parsed.get("priority"),
+                categories=parsed.get("categories")
+            )
 
-        return ParsedTaskResponse(
-            title=parsed.get("title", text),
-            description=parsed.get("description"),
-            due_date=parsed.get("due_date"),
-            priority=parsed.get("priority"),
-            categories=parsed.get("categories")
-        )
+        return await self.generate_json(prompt, cache=True, validate=to_response)
 
     async def get_suggestions(self, tasks: list[dict]) -> list[TaskSuggestion]:
         """Generate task suggestions based on existing tasks."""
@@ -86,71 +281,108 @@ Example: [{{"title": "Review grocery list", "reason": "Preparation for your shop
 
 Return only the JSON array, no markdown formatting."""
 
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-            result_text = result_text.strip()
-
-        suggestions = json.loads(result_text)
+        suggestions = await self.generate_json(prompt)
 
         return [TaskSuggestion(title=s["title"], reason=s["reason"]) for s in suggestions]
 
     async def categorize_task(self, title: str, description: Optional[str] = None) -> list[str]:
-        """Auto-categorize a task."""
-        task_text = title
-        if description:
-            task_text += f" - {description}"
+        """
+        Auto-categorize a task.
+
+        Raises:
+            ValueError: If the model does not answer with a list of strings
+        """
+        prompt = categorize_prompt(task_text(title, description))
+        return await self.generate_json(prompt, cache=True, validate=require_categories)
+
+    async def categorize_tasks(
+        self, tasks: list[tuple[int, str, Optional[str]]]
+    ) -> tuple[dict[int, list[str]], list[int]]:
+        """
+        Categorize many tasks with as few model calls as possible.
+
+        Tasks already categorized (by either endpoint) are answered from the
+        cache. The rest are deduplicated by text and packed into prompts of
+        at most ``batch_max_items`` tasks and roughly ``batch_token_budget``
+        tokens, which run concurrently, ``batch_concurrency`` at a time.
+        Each answer is cached under the single-task prompt, so a later
+        ``categorize_task`` for the same text is a cache hit.
+
+        Args:
+            tasks: ``(task_id, title, description)`` tuples
+
+        Returns:
+            Categories by task ID, and the IDs whose chunk failed or whose
+            answer was not a list of strings
+
+        Raises:
+            TimeoutError: If every chunk timed out
+        """
+        results: dict[int, list[str]] = {}
+        ids_by_text: dict[str, list[int]] = {}
+        for task_id, title, description in tasks:
+            ids_by_text.setdefault(task_text(title, description), []).append(task_id)
+
+        pending: list[str] = []
+        for text, task_ids in ids_by_text.items():
+            key = cache_key(self.backend.name, categorize_prompt(text))
+            categories = valid_categories(await self.cache.get(key))
+            if categories is None:
+                pending.append(text)
+            else:
+                for task_id in task_ids:
+                    results[task_id] = categories
+
+        chunks = chunk_texts(pending, self.batch_token_budget, self.batch_max_items)
+        limiter = asyncio.Semaphore(self.batch_concurrency)
+
+        async def run(chunk: list[str]) -> dict[str, Optional[list[str]]]:
+            async with limiter:
+                answer = await self.generate_json(batch_categorize_prompt(chunk))
+            found: dict[str, Optional[list[str]]] = {}
+            for number, text in enumerate(chunk, start=1):
+                categories = valid_categories(
+                    answer.get(str(number)) if isinstance(answer, dict) else None
+                )
+                if categories is None:
+                    # The model skipped or garbled this one; ask for it on its own.
+                    try:
+                        categories = await self.categorize_task(text)
+                    except ValueError:
+                        pass  # Reported as failed
+                else:
+                    await self.cache.set(
+                        cache_key(self.backend.name, categorize_prompt(text)), categories
+                    )
+                found[text] = categories
+            return found
+
+        outcomes = await asyncio.gather(*(run(chunk) for chunk in chunks), return_exceptions=True)
+        failures = [o for o in outcomes if isinstance(o, BaseException)]
+        if failures and len(failures) == len(outcomes):
+            raise failures[0]
+
+        failed: list[int] = []
+        for chunk, outcome in zip(chunks, outcomes):
+            for text in chunk:
+                if isinstance(outcome, BaseException) or outcome[text] is None:
+                    failed.extend(ids_by_text[text])
+                else:
+                    for task_id in ids_by_text[text]:
+                        results[task_id] = outcome[text]
+        return results, failed
+
+    async def generate_summary(self, stats: SummaryStats, incomplete_tasks: list[dict]) -> str:
+        """
+        Generate a daily summary of tasks.
+
+        Args:
+            stats: Precomputed counts for all of the user's tasks
+            incomplete_tasks: The few open tasks to mention in the prompt
+        """
+        if not stats.total:
+            return "No tasks yet. Add some tasks to get started!"
 
-        prompt = f"""Categorize this task into 1-3 relevant categories.
-
-Task: "{task_text}"
-
-Common categories: work, personal, shopping, health, finance, home, errands, learning, social, travel
-
-Return ONLY a JSON array of category strings, e.g., ["work", "urgent"]
-No markdown formatting."""
-
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-            result_text = result_text.strip()
-
-        categories = json.loads(result_text)
-        return categories[:3]  # Limit to 3 categories
-
-    async def generate_summary(self, tasks: list[dict]) -> tuple[str, SummaryStats]:
-        """Generate a daily summary of tasks."""
-        now = datetime.now()
-
-        # Calculate stats
-        total = len(tasks)
-        completed = sum(1 for t in tasks if t.get("completed"))
-        high_priority = sum(1 for t in tasks if t.get("priority") == "high" and not t.get("completed"))
-        overdue = sum(
-            1 for t in tasks
-            if t.get("due_date") and not t.get("completed")
-            and datetime.fromisoformat(t["due_date"].replace("Z", "+00:00")) < now
-        )
-
-        stats = SummaryStats(
-            total=total,
-            high_priority=high_priority,
-            completed=completed,
-            overdue=overdue
-        )
-
-        if not tasks:
-            return "No tasks yet. Add some tasks to get started!", stats
-
-        incomplete_tasks = [t for t in tasks if not t.get("completed")][:10]
         tasks_summary = "\n".join([
             f"- {t['title']} (priority: {t.get('priority', 'none')}, due: {t.get('due_date', 'none')})"
             for t in incomplete_tasks
@@ -158,7 +390,7 @@ No markdown formatting."""
 
         prompt = f"""Generate a brief, helpful daily summary for these tasks.
 
-Stats: {total} total, {completed} completed, {high_priority} high priority, {overdue} overdue
+Stats: {stats.total} total, {stats.completed} completed, {stats.high_priority} high priority, {stats.overdue} overdue
 
 Incomplete tasks:
 {tasks_summary}
@@ -166,11 +398,15 @@ Incomplete tasks:
 Write 2-3 sentences: acknowledge progress, highlight priorities, give one actionable suggestion.
 Be encouraging but concise. No markdown formatting."""
 
-        response = model.generate_content(prompt)
-        summary = response.text.strip()
-
-        return summary, stats
+        return (await self.generate(prompt)).strip()
 
 
 # Singleton instance
-ai_service = AIService()
+ai_service = AIService(
+    create_backend(),
+    cache=AICache(
+        max_entries=settings.AI_CACHE_SIZE,
+        ttl=settings.AI_CACHE_TTL_SECONDS,
+        disk_path=settings.AI_CACHE_PATH or None,
+    ),
+)
@@ -0,0 +1,281 @@
+"""Per-user task change feed with pluggable fan-out."""
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_changes"
+# Postgres rejects NOTIFY payloads of this many bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 8000
+_PENDING = "task_changes"  # Session.info key for events awaiting commit
+
+
+def task_upserted(task: Any) -> dict[str, Any]:
+    """Build the event for a created or changed task (a ``TaskResponse``)."""
+    return {"type": "upsert", "task_id": task.id, "task": task.model_dump(mode="json")}
+
+
+def task_deleted(task_id: int) -> dict[str, Any]:
+    """Build the event for a deleted task."""
+    return {"type": "delete", "task_id": task_id, "task": None}
+
+
+def task_reset(event: dict[str, Any]) -> dict[str, Any]:
+    """Replace an event by one telling its clients to reload the task list."""
+    return {"id": event["id"], "type": "reset", "task_id": event["task_id"], "task": None}
+
+
+@dataclass(eq=False)
+class Subscription:
+    """
+    One client's view of a user's change stream.
+
+    ``backlog`` holds buffered events after the client's cursor. ``reset``
+    means the cursor is no longer buffered (or events were dropped), so
+    the client must reload the task list before applying new events.
+    """
+
+    user_id: str
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    backlog: list[dict[str, Any]] = field(default_factory=list)
+    reset: bool = False
+
+
+# Put on a subscriber's queue when it fell too far behind to catch up.
+RESET = {"type": "reset"}
+
+
+class ChangeBroker:
+    """
+    In-process fan-out of task changes to subscribers on this worker.
+
+    Mutations stage events on their session with ``stage``; they are
+    delivered only after that session commits and dropped on rollback.
+    Each user keeps a ring buffer of the last ``buffer_size`` events so a
+    reconnecting client can resume from the last event ID it saw. Buffers
+    exist for at most ``max_users`` recently active users.
+    """
+
+    def __init__(self, buffer_size: int = 256, max_users: int = 10_000,
+                 queue_size: int = 1000):
+        self.buffer_size = buffer_size
+        self.max_users = max_users
+        self.queue_size = queue_size
+        self._buffers: OrderedDict[str, deque] = OrderedDict()
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    async def start(self) -> None:
+        """Start any background work; the in-process broker has none."""
+
+    async def stop(self) -> None:
+        """Stop background work."""
+
+    def stage(self, session: Session, user_id: str, events: list[dict[str, Any]]) -> None:
+        """Queue events to publish once ``session`` commits."""
+        stamped = [{"id": uuid.uuid4().hex, **e} for e in events]
+        session.info.setdefault(_PENDING, []).append((user_id, stamped))
+
+    def publish_committed(self, batches: list[tuple[str, list[dict[str, Any]]]]) -> None:
+        """Fan out events from a committed transaction."""
+        for user_id, events in batches:
+            self.dispatch(user_id, events)
+
+    def dispatch(self, user_id: str, events: list[dict[str, Any]]) -> None:
+        """Record events in the user's buffer and wake their subscribers."""
+        with self._lock:
+            buffer = self._buffers.get(user_id)
+            if buffer is None:
+                buffer = self._buffers[user_id] = deque(maxlen=self.buffer_size)
+                while len(self._buffers) > self.max_users:
+                    self._buffers.popitem(last=False)
+            self._buffers.move_to_end(user_id)
+            buffer.extend(events)
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(self._deliver, subscription, events)
+            except RuntimeError:
+                self.unsubscribe(subscription)  # Its event loop is gone
+
+    @staticmethod
+    def _deliver(subscription: Subscription, events: list[dict[str, Any]]) -> None:
+        queue = subscription.queue
+        for e in events:
+            if queue.full():
+                # Too slow to keep up: make the client start over.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESET)
+                return
+            queue.put_nowait(e)
+
+    def reset_all(self) -> None:
+        """Tell every subscriber to reload, e.g. after missing notifications."""
+        with self._lock:
+            subscribers = [s for subs in self._subscribers.values() for s in subs]
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(
+                lambda s=subscription: (s.queue.put_nowait(RESET) if not s.queue.full() else None)
+            )
+
+    def subscribe(self, user_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Register a subscriber on the running event loop.
+
+        With ``last_event_id``, buffered events after it are returned in the
+        backlog, or ``reset`` is set if that event is no longer buffered.
+        """
+        subscription = Subscription(
+            user_id=user_id,
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            loop=asyncio.get_running_loop(),
+        )
+        with self._lock:
+            if last_event_id:
+                buffered = list(self._buffers.get(user_id, ()))
+                ids = [e["id"] for e in buffered]
+                if last_event_id in ids:
+                    subscription.backlog = buffered[ids.index(last_event_id) + 1:]
+                else:
+                    subscription.reset = True
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+
+class PostgresChangeBroker(ChangeBroker):
+    """
+    Fan-out across replicas through Postgres LISTEN/NOTIFY.
+
+    ``stage`` sends ``pg_notify`` inside the mutation's transaction, so
+    Postgres delivers it to every replica's listener exactly when the
+    transaction commits, in commit order. Each replica's listener then
+    dispatches locally, so all replicas buffer the same events under the
+    same IDs and a client can resume against any of them. Notifications
+    missed while the listener reconnects trigger a reset.
+
+    An event too large for a notification (a task with a very long
+    description) is sent as a ``reset`` event under the same ID instead,
+    so the write still commits and its clients reload.
+    """
+
+    RECONNECT_SECONDS = 1.0
+
+    def __init__(self, database_url: str, **kwargs):
+        super().__init__(**kwargs)
+        url = make_url(database_url)
+        query = dict(url.query)
+        query.pop("channel_binding", None)  # Not understood by asyncpg
+        self.dsn = url.set(drivername="postgresql", query=query).render_as_string(
+            hide_password=False
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    def stage(self, session: Session, user_id: str, events: list[dict[str, Any]]) -> None:
+        stamped = [{"id": uuid.uuid4().hex, **e} for e in events]
+        session.connection().execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            [{"channel": CHANNEL, "payload": self._payload(user_id, e)} for e in stamped],
+        )
+
+    @staticmethod
+    def _payload(user_id: str, event: dict[str, Any]) -> str:
+        payload = json.dumps({"user_id": user_id, "event": event})
+        if len(payload.encode()) >= NOTIFY_PAYLOAD_LIMIT:
+            payload = json.dumps({"user_id": user_id, "event": task_reset(event)})
+        return payload
+
+    def publish_committed(self, batches: list[tuple[str, list[dict[str, Any]]]]) -> None:
+        """Nothing to do: the listener receives the notifications."""
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        message = json.loads(payload)
+        self.dispatch(message["user_id"], [message["event"]])
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        first = True
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _, closed=closed: closed.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+            except (OSError, TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning("Listening for task changes failed, retrying: %r", e)
+                if conn is not None:
+                    conn.terminate()
+                await asyncio.sleep(self.RECONNECT_SECONDS)
+                continue
+            if not first:
+                self.reset_all()
+            first = False
+            try:
+                await closed.wait()
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def create_broker() -> ChangeBroker:
+    """Build the broker selected by ``CHANGE_FEED_BACKEND``."""
+    if settings.CHANGE_FEED_BACKEND == "memory":
+        return ChangeBroker(buffer_size=settings.CHANGE_FEED_BUFFER)
+    if settings.CHANGE_FEED_BACKEND == "postgres":
+        return PostgresChangeBroker(
+            settings.DATABASE_URL, buffer_size=settings.CHANGE_FEED_BUFFER
+        )
+    raise ValueError(f"Unknown CHANGE_FEED_BACKEND: {settings.CHANGE_FEED_BACKEND!r}")
+
+
+# Singleton instance
+change_feed = create_broker()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    batches = session.info.pop(_PENDING, None)
+    if batches:
+        change_feed.publish_committed(batches)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
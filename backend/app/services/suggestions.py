@@ -0,0 +1,161 @@
+"""Task suggestions: the prompt context query and the background refresher."""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from typing import Optional
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.database import async_engine
+from app.models import SuggestionSet, Task, utc_now
+from app.schemas import TaskSuggestion
+from app.services.ai_service import ai_service
+from app.services.task_cache import task_cache
+
+logger = logging.getLogger(__name__)
+
+# Tasks given to the model as context for suggestions
+CONTEXT_TASK_LIMIT = 10
+
+
+async def load_suggestion_context(session: AsyncSession, user_id: str) -> list[dict]:
+    """
+    Return the tasks the suggestion prompt is built from.
+
+    Open tasks come first, soonest due date first (undated last), then the
+    most recently created; only ``CONTEXT_TASK_LIMIT`` rows are fetched.
+    """
+    cached, generation = await task_cache.aget(user_id, "suggestion-context")
+    if cached is not None:
+        return cached
+
+    statement = (
+        select(Task.title, Task.completed, Task.priority)
+        .where(Task.user_id == user_id)
+        .order_by(
+            Task.completed,
+            Task.due_date.is_(None),
+            Task.due_date,
+            Task.created_at.desc(),
+        )
+        .limit(CONTEXT_TASK_LIMIT)
+    )
+    context = [
+        {"title": t.title, "completed": t.completed, "priority": t.priority}
+        for t in (await session.exec(statement)).all()
+    ]
+    await task_cache.aset(user_id, generation, "suggestion-context", context)
+    return context
+
+
+async def store_suggestions(
+    session: AsyncSession, user_id: str, suggestions: list[TaskSuggestion]
+) -> SuggestionSet:
+    """Save a user's suggestions, replacing any earlier ones."""
+    stored = await session.merge(
+        SuggestionSet(
+            user_id=user_id,
+            suggestions=[s.model_dump() for s in suggestions],
+            generated_at=utc_now(),
+        )
+    )
+    await session.commit()
+    return stored
+
+
+class SuggestionRefresher:
+    """
+    Precompute suggestions for users whose tasks changed.
+
+    Task routes call ``mark_dirty`` after each change, from any thread. A
+    background loop wakes every ``interval`` seconds and regenerates the
+    suggestions of every user marked since the previous pass, so a burst
+    of edits costs one model call. Results are stored in the
+    ``task_suggestions`` table, which ``GET /api/tasks/suggestions`` reads.
+
+    At most ``max_concurrency`` users are refreshed at once, and a database
+    session is held only while reading the context and while storing the
+    result, never across the model call, so a large batch of dirty users
+    cannot drain the connection pool.
+
+    An ``interval`` of 0 disables the refresher; suggestions are then
+    generated on request. It is also off while the AI features are.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.AI_SUGGESTIONS_REFRESH_SECONDS,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        max_concurrency: int = settings.AI_MAX_CONCURRENCY,
+    ):
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.session_factory = session_factory or (lambda: AsyncSession(async_engine))
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0 and ai_service.enabled
+
+    def mark_dirty(self, user_id: str) -> None:
+        """Queue a user's suggestions for regeneration."""
+        if self.enabled:
+            with self._lock:
+                self._dirty.add(user_id)
+
+    async def refresh(self, user_id: str) -> SuggestionSet:
+        """Regenerate and store one user's suggestions."""
+        async with self.session_factory() as session:
+            context = await load_suggestion_context(session, user_id)
+        suggestions = await ai_service.get_suggestions(context)
+        async with self.session_factory() as session:
+            return await store_suggestions(session, user_id, suggestions)
+
+    async def run_once(self) -> int:
+        """Refresh every queued user and return how many were refreshed."""
+        with self._lock:
+            users, self._dirty = self._dirty, set()
+        limiter = asyncio.Semaphore(self.max_concurrency)
+
+        async def refresh(user_id: str) -> SuggestionSet:
+            async with limiter:
+                return await self.refresh(user_id)
+
+        results = await asyncio.gather(
+            *(refresh(user_id) for user_id in users), return_exceptions=True
+        )
+        for user_id, result in zip(users, results):
+            if isinstance(result, BaseException):
+                # Keep serving the previous suggestions; the next change retries.
+                logger.warning("Refreshing suggestions for %s failed: %r", user_id, result)
+        return sum(not isinstance(result, BaseException) for result in results)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    def start(self) -> None:
+        """Start the background loop on the running event loop."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+suggestion_refresher = SuggestionRefresher()
@@ -0,0 +1,218 @@
+"""Per-user read-through cache for task queries."""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Optional
+
+from app.config import settings
+
+
+class CacheStore(ABC):
+    """Key-value storage behind ``TaskCache``. Values are JSON strings."""
+
+    #: True if calls do network I/O and should stay off the event loop.
+    blocking: bool = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the value for ``key``, or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store ``value`` for ``ttl`` seconds, or until evicted if None."""
+
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    def size(self) -> Optional[int]:
+        """Return the number of entries, if the store can tell cheaply."""
+        return None
+
+
+class MemoryStore(CacheStore):
+    """
+    Bounded in-process LRU with per-entry expiry.
+
+    Invalidations reach only this process, so other workers would keep
+    serving stale results: use it only with a single worker.
+    """
+
+    def __init__(self, max_entries: int = 10_000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        expires_at = float("inf") if ttl is None else self.clock() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisStore(CacheStore):
+    """
+    Redis (or any server speaking its protocol) shared by every pod.
+
+    Size is bounded by the server's ``maxmemory`` with an LRU eviction
+    policy such as ``allkeys-lru``.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("TASK_CACHE_BACKEND=redis requires the redis package") from e
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self.client.set(key, value, px=None if ttl is None else int(ttl * 1000))
+
+
+class TaskCache:
+    """
+    Read-through cache of task query results, keyed by user and query shape.
+
+    Each user has a random generation token that is part of every key.
+    Writes replace it with ``invalidate``, which makes all of that user's
+    entries unreachable at once; they then age out of the store. A token
+    lost to eviction is replaced by a fresh one, never reused, so old
+    entries cannot resurface. Readers capture the generation before
+    querying the database, so a result read before a concurrent write
+    commits is filed under the old generation and is never served.
+    """
+
+    def __init__(self, store: Optional[CacheStore], ttl: float = 300):
+        self.store = store
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def generation(self, user_id: str) -> str:
+        """Return the user's current generation token, creating one if needed."""
+        generation = self.store.get(f"gen:{user_id}")
+        if generation is None:
+            generation = self._new_generation(user_id)
+        return generation
+
+    def _new_generation(self, user_id: str) -> str:
+        generation = uuid.uuid4().hex[:12]
+        self.store.set(f"gen:{user_id}", generation)
+        return generation
+
+    def _key(self, user_id: str, generation: str, shape: str) -> str:
+        return f"tasks:{user_id}:{generation}:{shape}"
+
+    def get(self, user_id: str, shape: str) -> tuple[Optional[Any], str]:
+        """
+        Look up a cached result.
+
+        Returns:
+            The cached value (or None) and the generation to store under
+        """
+        if self.store is None:
+            return None, ""
+        generation = self.generation(user_id)
+        raw = self.store.get(self._key(user_id, generation, shape))
+        if raw is None:
+            self.misses += 1
+            return None, generation
+        self.hits += 1
+        return json.loads(raw), generation
+
+    def set(self, user_id: str, generation: str, shape: str, value: Any,
+            ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable result under the generation from ``get``."""
+        if self.store is not None:
+            self.store.set(
+                self._key(user_id, generation, shape), json.dumps(value), ttl or self.ttl
+            )
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget every cached result for a user. Call after the write commits."""
+        if self.store is not None:
+            self._new_generation(user_id)
+
+    async def aget(self, user_id: str, shape: str) -> tuple[Optional[Any], str]:
+        """``get`` for async routes; network stores run in a thread."""
+        if self.store is not None and self.store.blocking:
+            return await asyncio.to_thread(self.get, user_id, shape)
+        return self.get(user_id, shape)
+
+    async def aset(self, user_id: str, generation: str, shape: str, value: Any,
+                   ttl: Optional[float] = None) -> None:
+        """``set`` for async routes."""
+        if self.store is not None and self.store.blocking:
+            await asyncio.to_thread(self.set, user_id, generation, shape, value, ttl)
+        else:
+            self.set(user_id, generation, shape, value, ttl)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        if self.store is not None:
+            self.store.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for this worker."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self.store.size() if self.store is not None else 0,
+        }
+
+
+def create_task_cache() -> TaskCache:
+    """Build the cache selected by ``TASK_CACHE_BACKEND``."""
+    backend = settings.TASK_CACHE_BACKEND
+    if backend == "none":
+        store = None
+    elif backend == "memory":
+        store = MemoryStore(max_entries=settings.TASK_CACHE_SIZE)
+    elif backend == "redis":
+        store = RedisStore(settings.TASK_CACHE_URL)
+    else:
+        raise ValueError(f"Unknown TASK_CACHE_BACKEND: {backend!r}")
+    return TaskCache(store, ttl=settings.TASK_CACHE_TTL_SECONDS)
+
+
+# Singleton instance
+task_cache = create_task_cache()
@@ -0,0 +1,70 @@
+"""Normalized task categories behind category filters and facet counts."""
+
+from collections.abc import Iterable
+from typing import Optional
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import Session, select
+
+from app.models import Task, TaskCategory
+
+
+def normalize_categories(categories: Optional[Iterable[str]]) -> list[str]:
+    """Lowercase, trim and de-duplicate category names, keeping their order."""
+    normalized = (c.strip().lower() for c in categories or ())
+    return list(dict.fromkeys(c for c in normalized if c))
+
+
+def set_categories(
+    session: Session,
+    user_id: str,
+    categories_by_task: dict[int, Optional[list[str]]],
+    replace: bool = True,
+) -> None:
+    """
+    Write the category rows of the given tasks in the session's transaction.
+
+    Args:
+        session: Session of the write that changed ``Task.categories``
+        user_id: Owner of every task in ``categories_by_task``
+        categories_by_task: New categories per task ID
+        replace: Delete existing rows first; False for newly created tasks
+    """
+    if not categories_by_task:
+        return
+    if replace:
+        delete_categories(session, user_id, categories_by_task)
+    rows = [
+        {"task_id": task_id, "category": category, "user_id": user_id}
+        for task_id, categories in categories_by_task.items()
+        for category in normalize_categories(categories)
+    ]
+    if rows:
+        session.exec(insert(TaskCategory), params=rows)
+
+
+def delete_categories(session: Session, user_id: str, task_ids: Iterable[int]) -> None:
+    """Delete the category rows of a user's tasks; run before deleting the tasks."""
+    session.exec(
+        delete(TaskCategory)
+        .where(TaskCategory.user_id == user_id, TaskCategory.task_id.in_(list(task_ids)))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def category_filter(user_id: str, categories: list[str], match: str = "any") -> ColumnElement:
+    """
+    Build a ``Task`` filter for tasks in any or all of ``categories``.
+
+    Both forms are answered from ``ix_task_categories_user_category``.
+    """
+    categories = normalize_categories(categories)
+    matching = select(TaskCategory.task_id).where(
+        TaskCategory.user_id == user_id, TaskCategory.category.in_(categories)
+    )
+    if match == "all":
+        matching = matching.group_by(TaskCategory.task_id).having(
+            func.count() == len(categories)
+        )
+    return Task.id.in_(matching)
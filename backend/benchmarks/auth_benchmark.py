@@ -0,0 +1,63 @@
+"""Benchmark per-request JWT verification with and without the token cache.
+
+Usage:
+    cd backend && PYTHONPATH=. python benchmarks/auth_benchmark.py [requests]
+
+Simulates a page view's worth of API calls reusing a handful of bearer
+tokens and prints the mean cost of ``verify_token`` per request: first
+with the cache disabled (a full ``jwt.decode`` and HMAC check every time),
+then with it enabled.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("BETTER_AUTH_SECRET", "benchmark-secret")
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from app import auth  # noqa: E402
+from app.auth import TokenCache, verify_token  # noqa: E402
+from app.config import settings  # noqa: E402
+
+DEFAULT_REQUESTS = 20_000
+USERS = 50
+
+
+def make_credentials(count: int) -> list[HTTPAuthorizationCredentials]:
+    """Sign one token per simulated user."""
+    exp = int(time.time()) + 3600
+    return [
+        HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=jwt.encode(
+                {"sub": f"user-{i}", "exp": exp}, settings.BETTER_AUTH_SECRET
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def time_requests(cache: TokenCache, requests: int) -> float:
+    """Return mean microseconds per ``verify_token`` call."""
+    auth.token_cache = cache
+    credentials = make_credentials(USERS)
+    start = time.perf_counter()
+    for i in range(requests):
+        verify_token(credentials[i % USERS])
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    uncached = time_requests(TokenCache(max_entries=0), requests)
+    cached = time_requests(TokenCache(), requests)
+    print(f"{requests} requests, {USERS} distinct tokens")
+    print(f"{'no cache':>10}: {uncached:8.2f} us/request")
+    print(f"{'cache':>10}: {cached:8.2f} us/request ({uncached / cached:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Load-test the backend API against a seeded database.
+
+Usage:
+    cd backend && PYTHONPATH=. python benchmarks/load_benchmark.py [options]
+
+Seeds ``--users`` users with ``--tasks-per-user`` tasks each into a fresh
+database (a temporary SQLite file by default, or ``--database-url`` for a
+local Postgres), then drives the real FastAPI app in-process through
+httpx's ASGI transport. Each endpoint is run as its own phase of
+``--requests`` requests at ``--concurrency`` in flight, with random users
+authenticating with real JWTs, and AI endpoints answered by the offline
+fake model. Prints p50/p95/p99 latency and throughput per endpoint and
+writes them, with the commit and settings, to a JSON file under
+``benchmarks/results/``. Pass ``--compare`` an earlier result file to see
+the change per endpoint.
+
+Example at scale (10M rows, give it a while to seed):
+    python benchmarks/load_benchmark.py --users 1000 --tasks-per-user 10000
+
+The database given by ``--database-url`` is dropped and recreated.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SECRET = "benchmark-secret"
+PRIORITIES = [None, "low", "medium", "high"]
+TITLES = [
+    "Write report", "Buy milk", "Pay the electricity bill", "Call mom",
+    "Book flight", "Review pull request", "Clean the garage", "Study for exam",
+]
+PARSE_INPUTS = [
+    "urgent: pay the electricity bill tomorrow",
+    "buy milk today",
+    "book a hotel for the trip someday",
+    "call the dentist tomorrow",
+]
+SEED_BATCH = 10_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks-per-user", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--ai-latency-ms", type=float, default=0,
+                        help="simulated model latency for AI endpoints")
+    parser.add_argument("--no-cache", action="store_true", help="disable the task read cache")
+    parser.add_argument("--endpoints", help="comma-separated subset of endpoints to run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="result file (default: results/<commit>-<database>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    return parser.parse_args()
+
+
+def configure(args: argparse.Namespace) -> str:
+    """Point the app's settings at the benchmark database and fake model.
+
+    Must run before any ``app`` module is imported.
+    """
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/load.db"
+    os.environ.update({
+        "DATABASE_URL": url,
+        "BETTER_AUTH_SECRET": SECRET,
+        "AI_BACKEND": "fake",
+        "AI_FAKE_LATENCY_MS": str(args.ai_latency_ms),
+        "TASK_CACHE_BACKEND": "none" if args.no_cache else "memory",
+    })
+    return url
+
+
+def seed(users: int, tasks_per_user: int, rng: random.Random) -> None:
+    """Recreate the schema and insert the synthetic tasks in batches."""
+    from sqlalchemy import insert
+    from sqlmodel import SQLModel
+
+    from app.database import engine
+    from app.models import Task, utc_now
+
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    # Stored as the app writes them: naive UTC timestamps, naive local due dates.
+    now, today = utc_now(), datetime.now()
+    rows = []
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for user in range(users):
+            for _ in range(tasks_per_user):
+                created = now - timedelta(minutes=rng.randrange(60 * 24 * 365))
+                rows.append({
+                    "user_id": f"user-{user}",
+                    "title": rng.choice(TITLES),
+                    "description": None,
+                    "completed": rng.random() < 0.4,
+                    "due_date": today + timedelta(days=rng.randrange(-30, 60))
+                    if rng.random() < 0.5 else None,
+                    "priority": rng.choice(PRIORITIES),
+                    "categories": None,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+                if len(rows) >= SEED_BATCH:
+                    conn.execute(insert(Task), rows)
+                    rows.clear()
+        if rows:
+            conn.execute(insert(Task), rows)
+    print(f"Seeded {users * tasks_per_user:,} tasks for {users:,} users "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+def make_tokens(users: int) -> list[str]:
+    from jose import jwt
+
+    exp = int(time.time()) + 24 * 3600
+    return [jwt.encode({"sub": f"user-{u}", "exp": exp}, SECRET) for u in range(users)]
+
+
+def endpoints(tasks_per_user: int, rng: random.Random):
+    """Return ``name -> request builder``; builders take a user index."""
+
+    def task_id(user: int) -> int:
+        # Seeded rows get ids in insertion order: user-major, from 1.
+        return user * tasks_per_user + rng.randrange(tasks_per_user) + 1
+
+    return {
+        "list": lambda u: ("GET", "/api/tasks?limit=50", None),
+        "list_pending": lambda u: ("GET", "/api/tasks?status=pending&limit=50", None),
+        "get": lambda u: ("GET", f"/api/tasks/{task_id(u)}", None),
+        "create": lambda u: ("POST", "/api/tasks", {"title": rng.choice(TITLES)}),
+        "toggle": lambda u: ("PATCH", f"/api/tasks/{task_id(u)}/complete", None),
+        "update": lambda u: ("PUT", f"/api/tasks/{task_id(u)}",
+                             {"priority": rng.choice(PRIORITIES[1:])}),
+        "stats": lambda u: ("GET", "/api/tasks/stats", None),
+        "ai_parse": lambda u: ("POST", "/api/tasks/parse", {"text": rng.choice(PARSE_INPUTS)}),
+        "ai_categorize": lambda u: ("POST", f"/api/tasks/{task_id(u)}/categorize", None),
+        "ai_summary": lambda u: ("GET", "/api/tasks/summary", None),
+    }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_phase(client, build, tokens, requests: int, concurrency: int,
+                    rng: random.Random) -> dict:
+    """Send ``requests`` requests, ``concurrency`` at a time, and time each one."""
+    latencies: list[float] = []
+    errors = 0
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        nonlocal errors
+        user = rng.randrange(len(tokens))
+        method, path, body = build(user)
+        async with limiter:
+            start = time.perf_counter()
+            response = await client.request(
+                method, path, json=body,
+                headers={"Authorization": f"Bearer {tokens[user]}"},
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": requests / elapsed,
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def run(args: argparse.Namespace, rng: random.Random) -> dict:
+    import httpx
+
+    from app.main import app
+
+    tokens = make_tokens(args.users)
+    selected = endpoints(args.tasks_per_user, rng)
+    if args.endpoints:
+        selected = {name: selected[name] for name in args.endpoints.split(",")}
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, build in selected.items():
+            results[name] = await run_phase(
+                client, build, tokens, args.requests, args.concurrency, rng
+            )
+            r = results[name]
+            print(f"{name:>14}: {r['throughput_rps']:8.1f} req/s  "
+                  f"p50 {r['p50_ms']:7.2f}  p95 {r['p95_ms']:7.2f}  p99 {r['p99_ms']:7.2f} ms"
+                  + (f"  ({r['errors']} errors)" if r["errors"] else ""))
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline_path: Path) -> None:
+    """Print the relative change in p95 and throughput per endpoint."""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline_path.name} (commit {baseline['commit']}):")
+    for name, r in results.items():
+        old = baseline["endpoints"].get(name)
+        if old is None:
+            continue
+        p95 = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+        rps = (r["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] * 100
+        print(f"{name:>14}: p95 {p95:+6.1f}%  throughput {rps:+6.1f}%")
+
+
+def main() -> None:
+    args = parse_args()
+    url = configure(args)
+    rng = random.Random(args.seed)
+
+    seed(args.users, args.tasks_per_user, rng)
+    results = asyncio.run(run(args, rng))
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": url.split(":", 1)[0],
+        "settings": {
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "ai_latency_ms": args.ai_latency_ms,
+            "task_cache": not args.no_cache,
+            "seed": args.seed,
+        },
+        "endpoints": results,
+    }
+    output = args.output or RESULTS_DIR / f"{commit}-{report['database']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,202 @@
 """Shared test fixtures."""
 
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
 
 from app.main import app
-from app.database import get_session
+from app.database import get_async_session, get_session
 from app.auth import verify_token
+from app.services.ai_backends import FakeBackend
+from app.services.ai_cache import AICache
+from app.services.ai_service import ai_service
+from app.services.task_cache import task_cache
+
+
+@dataclass
+class QueryCount:
+    """SQL statements executed and rows fetched while counting."""
+
+    statements: list[str] = field(default_factory=list)
+    rows: int = 0
+
+    def __str__(self) -> str:
+        return f"{len(self.statements)} statements, {self.rows} rows:\n" + "\n".join(
+            f"  {statement}" for statement in self.statements
+        )
+
+
+# Counts being collected; the cursor adds fetched rows to each.
+_active_counts: list[QueryCount] = []
+
+
+class CountingCursor(sqlite3.Cursor):
+    """
+    sqlite3 cursor that reports how many rows the driver hands back.
+
+    Only rows of statements that a count saw are added to it, which leaves
+    out the dialect's own queries when an engine first connects.
+    """
+
+    sql = None
+
+    def execute(self, sql, *args):
+        self.sql = sql
+        return super().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        self.sql = sql
+        return super().executemany(sql, *args)
+
+    def _counted(self, rows):
+        for count in _active_counts:
+            if self.sql in count.statements:
+                count.rows += len(rows)
+        return rows
+
+    def fetchone(self):
+        row = super().fetchone()
+        return row if row is None else self._counted([row])[0]
+
+    def fetchmany(self, size=None):
+        return self._counted(super().fetchmany(self.arraysize if size is None else size))
+
+    def fetchall(self):
+        return self._counted(super().fetchall())
+
+
+class CountingConnection(sqlite3.Connection):
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+@pytest.fixture(name="database_path")
+def database_path_fixture():
+    """
+    Name a shared-cache in-memory SQLite database for one test.
+
+    The sync and async engines both connect to it, so data written through
+    one session is visible to the other.
+    """
+    return f"file:test-{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
 
 
 @pytest.fixture(name="session")
-def session_fixture():
+def session_fixture(database_path: str):
     """Create an in-memory SQLite database session for testing."""
     engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
+        f"sqlite:///{database_path}",
+        connect_args={"check_same_thread": False, "factory": CountingConnection},
         poolclass=StaticPool,
     )
     SQLModel.metadata.create_all(engine)
     with Session(engine) as session:
         yield session
+    engine.dispose()
+
+
+@pytest.fixture(name="async_engine")
+def async_engine_fixture(session: Session, database_path: str):
+    """Create an async engine on the same database as ``session``."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}",
+        connect_args={"factory": CountingConnection},
+        poolclass=StaticPool,
+    )
+    yield engine
+    engine.sync_engine.dispose()
+
+
+@pytest.fixture(name="fake_ai")
+def fake_ai_fixture():
+    """Answer AI calls with the deterministic offline backend and an empty cache."""
+    real_backend, real_cache = ai_service.backend, ai_service.cache
+    ai_service.backend = FakeBackend()
+    ai_service.cache = AICache()
+    yield ai_service.backend
+    ai_service.backend, ai_service.cache = real_backend, real_cache
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
+def client_fixture(session: Session, async_engine, fake_ai):
     """Create a test client with overridden dependencies."""
 
     def get_session_override():
         return session
 
+    async def get_async_session_override():
+        async with AsyncSession(async_engine) as async_session:
+            yield async_session
+
     def verify_token_override():
         return "test-user-123"
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
     app.dependency_overrides[verify_token] = verify_token_override
 
+    task_cache.clear()
     client = TestClient(app)
     yield client
 
     app.dependency_overrides.clear()
+    task_cache.clear()
+
+
+@pytest.fixture(name="count_queries")
+def count_queries_fixture(session: Session, async_engine):
+    """
+    Count SQL statements and fetched rows on both test engines.
+
+    Use as ``with count_queries() as count:`` around client calls.
+    """
+    engines = [session.get_bind(), async_engine.sync_engine]
+
+    @contextmanager
+    def count_queries():
+        count = QueryCount()
+
+        def record(conn, cursor, statement, *args):
+            count.statements.append(statement)
+
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", record)
+        _active_counts.append(count)
+        try:
+            yield count
+        finally:
+            _active_counts.remove(count)
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", record)
+
+    return count_queries
+
+
+@pytest.fixture(name="query_budget")
+def query_budget_fixture(count_queries):
+    """
+    Fail if the enclosed calls exceed a statement or row budget.
+
+    Use as ``with query_budget(statements=1, rows=1):``. The task read
+    cache is cleared on entry, so the database path is what gets measured.
+    """
+
+    @contextmanager
+    def query_budget(statements: int, rows: int):
+        task_cache.clear()
+        with count_queries() as count:
+            yield count
+        assert len(count.statements) <= statements and count.rows <= rows, (
+            f"Query budget of {statements} statements, {rows} rows exceeded: {count}"
+        )
+
+    return query_budget
@@ -0,0 +1,425 @@
+"""Tests for AI endpoints that read tasks through the async session."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import settings
+from app.database import get_async_session
+from app.main import app
+from app.models import Task
+from app.services.ai_backends import FakeBackend, GeminiBackend, create_backend
+from app.services.ai_cache import AICache
+from app.services.ai_service import AIService, ai_service
+from app.services.suggestions import (
+    CONTEXT_TASK_LIMIT,
+    SuggestionRefresher,
+    load_suggestion_context,
+    suggestion_refresher,
+)
+
+
+def test_suggestions_without_tasks(client: TestClient):
+    """Test that a user with no tasks gets no suggestions."""
+    response = client.get("/api/tasks/suggestions")
+    assert response.status_code == 200
+    assert response.json() == {"suggestions": []}
+
+
+def test_summary_without_tasks(client: TestClient):
+    """Test the summary for a user with no tasks."""
+    response = client.get("/api/tasks/summary")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stats"] == {
+        "total": 0,
+        "high_priority": 0,
+        "completed": 0,
+        "overdue": 0,
+    }
+
+
+def test_stats_counts_in_sql(client: TestClient, session: Session):
+    """Test the summary stats endpoint, which makes no model call."""
+    past = datetime.now() - timedelta(days=1)
+    future = datetime.now() + timedelta(days=1)
+    session.add_all([
+        Task(user_id="test-user-123", title="Late", priority="high", due_date=past),
+        Task(user_id="test-user-123", title="Soon", due_date=future),
+        Task(user_id="test-user-123", title="Done", priority="high", due_date=past,
+             completed=True),
+        Task(user_id="someone-else", title="Not yours", due_date=past),
+    ])
+    session.commit()
+
+    response = client.get("/api/tasks/stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 3,
+        "high_priority": 1,
+        "completed": 1,
+        "overdue": 1,
+    }
+    assert client.get("/api/tasks/cache-stats").json()["misses"] == 0
+
+
+def test_async_session_sees_sync_writes(session: Session, async_engine):
+    """Test that both engines share one database."""
+    task = Task(user_id="test-user-123", title="Shared")
+    session.add(task)
+    session.commit()
+
+    async def fetch():
+        async with AsyncSession(async_engine) as async_session:
+            return await async_session.get(Task, task.id)
+
+    assert asyncio.run(fetch()).title == "Shared"
+
+
+def test_categorize_enforces_ownership(client: TestClient, session: Session):
+    """Test that categorizing another user's task returns 404."""
+    other = Task(user_id="someone-else", title="Not yours")
+    session.add(other)
+    session.commit()
+
+    response = client.post(f"/api/tasks/{other.id}/categorize")
+    assert response.status_code == 404
+
+    response = client.post("/api/tasks/9999/categorize")
+    assert response.status_code == 404
+
+
+def test_parse_with_fake_backend(client: TestClient):
+    """Test natural language parsing end to end with the offline model."""
+    response = client.post(
+        "/api/tasks/parse", json={"text": "urgent: pay the electricity bill tomorrow"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["priority"] == "high"
+    assert data["due_date"] is not None
+    assert data["categories"] == ["finance"]
+
+
+def test_categorize_own_task(client: TestClient):
+    """Test categorizing a task the user owns."""
+    task_id = client.post("/api/tasks", json={"title": "Buy milk"}).json()["id"]
+    response = client.post(f"/api/tasks/{task_id}/categorize")
+    assert response.status_code == 200
+    assert response.json() == {"categories": ["shopping"]}
+
+
+def test_suggestions_and_summary(client: TestClient):
+    """Test suggestions and summary for a user with open tasks."""
+    client.post("/api/tasks", json={"title": "Write report", "priority": "high"})
+
+    suggestions = client.get("/api/tasks/suggestions").json()["suggestions"]
+    assert suggestions[0]["title"] == "Follow up on Write report"
+
+    data = client.get("/api/tasks/summary").json()
+    assert data["stats"]["total"] == 1
+    assert data["stats"]["high_priority"] == 1
+    assert data["summary"]
+
+
+def test_suggestion_context_is_limited_and_ordered(session: Session, async_engine):
+    """Test that only the most relevant tasks reach the suggestion prompt."""
+    now = datetime.now()
+    session.add_all(
+        [Task(user_id="test-user-123", title=f"Done {i}", completed=True) for i in range(5)]
+        + [Task(user_id="test-user-123", title=f"Open {i}") for i in range(8)]
+        + [Task(user_id="test-user-123", title="Due soon", due_date=now + timedelta(days=1)),
+           Task(user_id="test-user-123", title="Overdue", due_date=now - timedelta(days=1))]
+    )
+    session.commit()
+
+    async def load():
+        async with AsyncSession(async_engine) as async_session:
+            return await load_suggestion_context(async_session, "test-user-123")
+
+    titles = [t["title"] for t in asyncio.run(load())]
+    assert len(titles) == CONTEXT_TASK_LIMIT
+    assert titles[:2] == ["Overdue", "Due soon"]
+    assert not any(title.startswith("Done") for title in titles)
+
+
+def test_refresher_precomputes_suggestions(client: TestClient, async_engine, monkeypatch):
+    """Test that changed users get suggestions stored in the background."""
+    refresher = SuggestionRefresher(
+        interval=60, session_factory=lambda: AsyncSession(async_engine)
+    )
+    marked = []
+    monkeypatch.setattr(suggestion_refresher, "mark_dirty", marked.append)
+    real_interval = suggestion_refresher.interval
+    suggestion_refresher.interval = 60
+    try:
+        client.post("/api/tasks", json={"title": "Write report"})
+        assert marked == ["test-user-123"]
+
+        refresher.mark_dirty("test-user-123")
+        assert asyncio.run(refresher.run_once()) == 1
+
+        async def no_model_call(prompt: str) -> str:
+            raise AssertionError("suggestions should be served from storage")
+
+        monkeypatch.setattr(ai_service, "generate", no_model_call)
+        data = client.get("/api/tasks/suggestions").json()
+    finally:
+        suggestion_refresher.interval = real_interval
+    assert data["suggestions"][0]["title"] == "Follow up on Write report"
+    assert data["generated_at"]
+
+
+def test_refresher_caps_concurrency_and_frees_connections(
+    session: Session, database_path: str, fake_ai: FakeBackend, monkeypatch
+):
+    """Test that refreshes are bounded and hold no connection during the model call."""
+    # One connection: if a refresh held it across the model call, calls could not overlap.
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}",
+        poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0,
+    )
+    refresher = SuggestionRefresher(
+        interval=60, session_factory=lambda: AsyncSession(engine), max_concurrency=2
+    )
+    in_flight = peak = 0
+
+    async def get_suggestions(context: list[dict]) -> list:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return []
+
+    monkeypatch.setattr(ai_service, "get_suggestions", get_suggestions)
+    for number in range(5):
+        refresher.mark_dirty(f"user-{number}")
+    try:
+        assert asyncio.run(refresher.run_once()) == 5
+    finally:
+        engine.sync_engine.dispose()
+    assert peak == 2
+
+
+def test_ai_timeout_returns_504(client: TestClient, fake_ai: FakeBackend):
+    """Test that a model call exceeding the timeout fails fast."""
+    fake_ai.latency = 1.0
+    real_timeout = ai_service.timeout
+    ai_service.timeout = 0.01
+    try:
+        response = client.post("/api/tasks/parse", json={"text": "anything"})
+    finally:
+        ai_service.timeout = real_timeout
+    assert response.status_code == 504
+
+
+def test_ai_disabled_without_api_key(client: TestClient, monkeypatch):
+    """Test that AI endpoints answer 503 and the rest keep working without a key."""
+    monkeypatch.setattr(settings, "AI_BACKEND", "gemini")
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "")
+    monkeypatch.setattr(ai_service, "backend", create_backend())
+    monkeypatch.setattr(suggestion_refresher, "interval", 60)
+
+    assert not ai_service.enabled
+    assert not suggestion_refresher.enabled
+    response = client.post("/api/tasks/parse", json={"text": "buy milk"})
+    assert response.status_code == 503
+    assert client.get("/api/tasks/summary").status_code == 503
+    assert client.get("/api/tasks/stats").status_code == 200
+    assert client.post("/api/tasks", json={"title": "Still works"}).status_code == 201
+
+
+def test_gemini_backend_defers_sdk():
+    """Test that building the Gemini backend does not load or configure the SDK."""
+    backend = GeminiBackend("key", model_name="gemini-test")
+    assert backend.name == "gemini-test"
+    assert backend._model is None
+
+
+def test_concurrency_limit():
+    """Test that no more than max_concurrency calls run at once."""
+
+    class CountingBackend(FakeBackend):
+        running = peak = 0
+
+        async def generate(self, prompt: str) -> str:
+            CountingBackend.running += 1
+            CountingBackend.peak = max(CountingBackend.peak, CountingBackend.running)
+            await asyncio.sleep(0.01)
+            CountingBackend.running -= 1
+            return "[]"
+
+    service = AIService(CountingBackend(), timeout=5, max_concurrency=2)
+
+    async def burst():
+        await asyncio.gather(*(service.generate("p") for _ in range(10)))
+
+    asyncio.run(burst())
+    assert CountingBackend.peak == 2
+
+
+def test_batch_categorize(client: TestClient, session: Session):
+    """Test categorizing several tasks in one request and saving the result."""
+    ids = [
+        client.post("/api/tasks", json={"title": title}).json()["id"]
+        for title in ("Buy milk", "Pay the tax bill", "Buy milk")
+    ]
+    other = Task(user_id="someone-else", title="Not yours")
+    session.add(other)
+    session.commit()
+
+    response = client.post(
+        "/api/tasks/categorize",
+        json={"task_ids": ids + [other.id, 9999], "apply": True},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == [
+        {"task_id": ids[0], "categories": ["shopping"]},
+        {"task_id": ids[1], "categories": ["finance"]},
+        {"task_id": ids[2], "categories": ["shopping"]},
+    ]
+    assert data["not_found"] == [other.id, 9999]
+    assert data["failed"] == []
+    assert data["applied"] is True
+
+    saved = client.get(f"/api/tasks/{ids[1]}").json()
+    assert saved["categories"] == ["finance"]
+    shopping = client.get("/api/tasks?category=shopping").json()["items"]
+    assert {t["id"] for t in shopping} == {ids[0], ids[2]}
+
+    # The single-task endpoint reuses the batch answers.
+    misses = client.get("/api/tasks/cache-stats").json()["misses"]
+    client.post(f"/api/tasks/{ids[0]}/categorize")
+    assert client.get("/api/tasks/cache-stats").json()["misses"] == misses
+
+
+def test_batch_categorize_chunks_calls():
+    """Test that a batch is split by item cap and runs one call per chunk."""
+
+    class CountingBackend(FakeBackend):
+        calls = 0
+
+        async def generate(self, prompt: str) -> str:
+            CountingBackend.calls += 1
+            return await super().generate(prompt)
+
+    service = AIService(
+        CountingBackend(), timeout=5, batch_max_items=10, batch_concurrency=2
+    )
+    tasks = [(i, f"Read chapter {i}", None) for i in range(25)]
+    categories, failed = asyncio.run(service.categorize_tasks(tasks))
+
+    assert CountingBackend.calls == 3
+    assert failed == []
+    assert categories[24] == ["learning"]
+
+
+def test_malformed_answers_are_not_cached():
+    """Test that a bad answer is asked again instead of being served from the cache."""
+
+    class FlakyBackend(FakeBackend):
+        calls = 0
+
+        async def generate(self, prompt: str) -> str:
+            FlakyBackend.calls += 1
+            if FlakyBackend.calls <= 2:
+                return '"not the expected shape"'
+            return await super().generate(prompt)
+
+    service = AIService(FlakyBackend(), timeout=5)
+
+    async def scenario():
+        for call in (service.categorize_task("Buy milk"), service.parse_task("Buy milk")):
+            with pytest.raises(ValueError):
+                await call
+        return (
+            await service.categorize_task("Buy milk"),
+            await service.parse_task("Buy milk"),
+            await service.categorize_task("Buy milk"),
+        )
+
+    categories, parsed, cached = asyncio.run(scenario())
+    assert categories == cached == ["shopping"]
+    assert parsed.title
+    assert FlakyBackend.calls == 4
+
+
+def test_batch_categorize_reports_malformed_answers(client: TestClient, monkeypatch):
+    """Test that a garbled answer fails only its task instead of the request."""
+    ids = [
+        client.post("/api/tasks", json={"title": title}).json()["id"]
+        for title in ("Buy milk", "Mystery")
+    ]
+
+    async def garbled(prompt: str) -> str:
+        if prompt.startswith("Categorize each of these tasks"):
+            return '{"1": ["shopping"], "2": [1, {"name": "work"}]}'
+        return '{"category": "work"}'  # Single-task retry: not a list either
+
+    monkeypatch.setattr(ai_service.backend, "generate", garbled)
+    response = client.post("/api/tasks/categorize", json={"task_ids": ids, "apply": True})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == [{"task_id": ids[0], "categories": ["shopping"]}]
+    assert data["failed"] == [ids[1]]
+    assert client.get(f"/api/tasks/{ids[1]}").json()["categories"] is None
+
+
+def test_model_calls_hold_no_transaction(client: TestClient, async_engine, monkeypatch):
+    """Test that AI routes end their read transaction before calling the model."""
+    task_id = client.post("/api/tasks", json={"title": "Buy milk"}).json()["id"]
+    sessions = []
+
+    async def tracked_session():
+        async with AsyncSession(async_engine) as async_session:
+            sessions.append(async_session)
+            yield async_session
+
+    in_transaction = []
+    real_generate = ai_service.backend.generate
+
+    async def generate(prompt: str) -> str:
+        in_transaction.append(sessions[-1].in_transaction())
+        return await real_generate(prompt)
+
+    app.dependency_overrides[get_async_session] = tracked_session
+    monkeypatch.setattr(ai_service.backend, "generate", generate)
+    assert client.get("/api/tasks/suggestions").status_code == 200
+    assert client.get("/api/tasks/summary").status_code == 200
+    assert client.post(f"/api/tasks/{task_id}/categorize").status_code == 200
+    ai_service.cache = AICache()
+    response = client.post("/api/tasks/categorize", json={"task_ids": [task_id], "apply": True})
+    assert response.json()["applied"] is True
+    assert in_transaction == [False] * 4
+
+
+def test_batch_categorize_skips_tasks_deleted_meanwhile(
+    client: TestClient, session: Session, monkeypatch
+):
+    """Test that applying categories re-checks tasks removed during the model call."""
+    ids = [
+        client.post("/api/tasks", json={"title": title}).json()["id"]
+        for title in ("Buy milk", "Pay the tax bill")
+    ]
+    real_generate = ai_service.backend.generate
+
+    async def generate(prompt: str) -> str:
+        session.delete(session.get(Task, ids[1]))
+        session.commit()
+        return await real_generate(prompt)
+
+    monkeypatch.setattr(ai_service.backend, "generate", generate)
+    data = client.post("/api/tasks/categorize", json={"task_ids": ids, "apply": True}).json()
+
+    assert data["results"] == [{"task_id": ids[0], "categories": ["shopping"]}]
+    assert data["not_found"] == [ids[1]]
+    assert client.get(f"/api/tasks/{ids[0]}").json()["categories"] == ["shopping"]
@@ -0,0 +1,65 @@
+"""Tests for the AI response cache."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.services.ai_cache import AICache, cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_and_ttl():
+    """Test that the memory tier is bounded and entries expire."""
+    clock = FakeClock()
+    cache = AICache(max_entries=2, ttl=60, clock=clock)
+
+    async def scenario():
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("a") == 1  # "a" is now most recent
+        await cache.set("c", 3)  # evicts "b"
+        assert await cache.get("b") is None
+        clock.now += 61
+        assert await cache.get("a") is None
+
+    asyncio.run(scenario())
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_disk_tier_is_shared(tmp_path):
+    """Test that a second cache on the same file sees the first one's entries."""
+    path = str(tmp_path / "ai-cache.sqlite")
+    writer = AICache(disk_path=path)
+    reader = AICache(disk_path=path)
+    key = cache_key("fake", "prompt")
+
+    async def scenario():
+        await writer.set(key, ["work"])
+        assert await reader.get(key) == ["work"]
+        assert await reader.get(key) == ["work"]
+
+    asyncio.run(scenario())
+    assert reader.stats()["disk_hits"] == 1
+    assert reader.stats()["memory_hits"] == 1
+
+
+def test_repeated_categorize_hits_cache(client: TestClient):
+    """Test that identical inputs across tasks reuse one model response."""
+    first = client.post("/api/tasks", json={"title": "Buy milk"}).json()["id"]
+    second = client.post("/api/tasks", json={"title": "Buy   milk "}).json()["id"]
+
+    assert client.post(f"/api/tasks/{first}/categorize").json() == {"categories": ["shopping"]}
+    assert client.post(f"/api/tasks/{second}/categorize").json() == {"categories": ["shopping"]}
+
+    stats = client.get("/api/tasks/cache-stats").json()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["hit_rate"] == 0.5
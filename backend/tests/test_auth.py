@@ -0,0 +1,89 @@
+"""Tests for JWT verification and the verified-token cache."""
+
+import time
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app import auth
+from app.auth import TokenCache, verify_token
+from app.config import settings
+
+
+def make_token(sub: str = "user-1", secret: Optional[str] = None, **claims) -> str:
+    claims.setdefault("exp", int(time.time()) + 3600)
+    return jwt.encode({"sub": sub, **claims}, secret or settings.BETTER_AUTH_SECRET)
+
+
+def bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    """Give each test an empty token cache."""
+    monkeypatch.setattr(auth, "token_cache", TokenCache())
+
+
+def test_repeat_token_skips_decode(monkeypatch):
+    """Test that a verified token is not decoded a second time."""
+    token = make_token()
+    calls = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(
+        auth.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw)
+    )
+
+    assert verify_token(bearer(token)) == "user-1"
+    assert verify_token(bearer(token)) == "user-1"
+    assert len(calls) == 1
+
+
+def test_invalid_token_is_not_cached():
+    """Test that a bad signature is rejected every time."""
+    token = make_token(secret="not-the-secret")
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            verify_token(bearer(token))
+        assert exc.value.status_code == 401
+
+
+def test_entry_expires_with_token():
+    """Test that a cached token stops working at its exp claim."""
+    now = [1000.0]
+    cache = TokenCache(max_ttl=300, clock=lambda: now[0])
+    cache.set("token", "secret", "user-1", exp=1010)
+
+    assert cache.get("token", "secret") == "user-1"
+    now[0] = 1010
+    assert cache.get("token", "secret") is None
+
+    cache.set("token", "secret", "user-1", exp=None)
+    now[0] = 1010 + 300
+    assert cache.get("token", "secret") is None
+
+
+def test_secret_rotation_clears_cache(monkeypatch):
+    """Test that tokens verified with an old secret are verified again."""
+    token = make_token()
+    assert verify_token(bearer(token)) == "user-1"
+
+    monkeypatch.setattr(settings, "BETTER_AUTH_SECRET", "rotated")
+    with pytest.raises(HTTPException):
+        verify_token(bearer(token))
+
+
+def test_cache_is_bounded():
+    """Test that the least recently used token is evicted first."""
+    cache = TokenCache(max_entries=2)
+    cache.set("a", "s", "user-a", exp=None)
+    cache.set("b", "s", "user-b", exp=None)
+    cache.get("a", "s")
+    cache.set("c", "s", "user-c", exp=None)
+
+    assert cache.get("b", "s") is None
+    assert cache.get("a", "s") == "user-a"
+    assert cache.get("c", "s") == "user-c"
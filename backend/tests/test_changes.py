@@ -0,0 +1,182 @@
+"""Tests for the task change feed."""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.routers.changes import event_stream, format_event
+from app.services.changes import (
+    NOTIFY_PAYLOAD_LIMIT,
+    RESET,
+    ChangeBroker,
+    PostgresChangeBroker,
+    change_feed,
+    task_deleted,
+)
+
+
+def test_mutations_reach_subscribers(client: TestClient):
+    """Test that committed task changes are streamed in order."""
+
+    async def scenario():
+        subscription = change_feed.subscribe("test-user-123")
+        try:
+            task = (await asyncio.to_thread(
+                client.post, "/api/tasks", json={"title": "Task"}
+            )).json()
+            await asyncio.to_thread(client.patch, f"/api/tasks/{task['id']}/complete")
+            await asyncio.to_thread(client.delete, f"/api/tasks/{task['id']}")
+            await asyncio.to_thread(client.delete, "/api/tasks/9999")  # No event
+            return task, [
+                await asyncio.wait_for(subscription.queue.get(), 1) for _ in range(3)
+            ], subscription.queue.empty()
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    task, events, drained = asyncio.run(scenario())
+    assert [e["type"] for e in events] == ["upsert", "upsert", "delete"]
+    assert events[0]["task"]["title"] == "Task"
+    assert events[1]["task"]["completed"] is True
+    assert events[2]["task_id"] == task["id"]
+    assert drained
+
+
+def test_resume_from_cursor():
+    """Test replaying buffered events after a cursor, and resetting when it is gone."""
+    broker = ChangeBroker(buffer_size=3)
+    events = [{"id": str(i), "type": "delete", "task_id": i, "task": None} for i in range(5)]
+    broker.dispatch("user-1", events)
+
+    async def subscribe(cursor):
+        subscription = broker.subscribe("user-1", cursor)
+        broker.unsubscribe(subscription)
+        return subscription
+
+    resumed = asyncio.run(subscribe("2"))
+    assert [e["id"] for e in resumed.backlog] == ["3", "4"]
+    assert not resumed.reset
+    assert asyncio.run(subscribe("0")).reset
+
+
+def test_slow_subscriber_is_reset():
+    """Test that a subscriber whose queue overflows is told to reload."""
+    broker = ChangeBroker(queue_size=2)
+
+    async def scenario():
+        subscription = broker.subscribe("user-1")
+        broker.dispatch("user-1", [{"id": str(i)} for i in range(3)])
+        await asyncio.sleep(0)
+        return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+    assert asyncio.run(scenario())[-1] is RESET
+
+
+def test_event_stream_format():
+    """Test the SSE rendering of backlog, live events and keepalives."""
+    broker = ChangeBroker()
+    broker.dispatch("user-1", [
+        {"id": "z", "type": "delete", "task_id": 9, "task": None},
+        {"id": "a", "type": "delete", "task_id": 1, "task": None},
+    ])
+
+    async def scenario():
+        stream = event_stream(broker, "user-1", "z", keepalive=0.01)
+        messages = [await anext(stream), await anext(stream), await anext(stream)]
+        await stream.aclose()
+        return messages
+
+    ready, change, keepalive = asyncio.run(scenario())
+    assert not broker._subscribers
+    assert ready.startswith("event: ready")
+    assert change.startswith("id: a\nevent: change\n")
+    assert json.loads(change.split("data: ")[1])["task_id"] == 1
+    assert keepalive == ": keepalive\n\n"
+
+
+def test_unstarted_stream_leaves_no_subscription():
+    """Test that a client gone before the stream starts is never subscribed."""
+    broker = ChangeBroker()
+
+    async def scenario():
+        stream = event_stream(broker, "user-1")
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert not broker._subscribers
+
+
+class RecordingSession:
+    """Stands in for a Session, keeping the parameters of each statement."""
+
+    def __init__(self):
+        self.params = []
+
+    def connection(self):
+        return self
+
+    def execute(self, statement, params):
+        self.params.extend(params)
+
+
+def test_oversized_notification_becomes_reset():
+    """Test that an event too large for NOTIFY is sent as a reset under its ID."""
+    broker = PostgresChangeBroker("postgresql://user@localhost/todo")
+    session = RecordingSession()
+    huge = {"type": "upsert", "task_id": 7, "task": {"description": "x" * NOTIFY_PAYLOAD_LIMIT}}
+    broker.stage(session, "user-1", [huge, task_deleted(8)])
+
+    reset, deleted = [json.loads(p["payload"])["event"] for p in session.params]
+    assert all(len(p["payload"].encode()) < NOTIFY_PAYLOAD_LIMIT for p in session.params)
+    assert reset["type"] == "reset" and reset["task_id"] == 7 and reset["task"] is None
+    assert deleted["type"] == "delete"
+    assert format_event(reset) == f"id: {reset['id']}\nevent: reset\ndata: {{}}\n\n"
+
+
+def test_listener_retries_when_listen_fails(monkeypatch):
+    """Test that a failing LISTEN reconnects instead of ending the listener."""
+    import asyncpg
+
+    class FakeConnection:
+        def __init__(self, fail: bool):
+            self.fail = fail
+            self.terminated = False
+
+        def add_termination_listener(self, callback):
+            pass
+
+        async def add_listener(self, channel, callback):
+            if self.fail:
+                raise asyncpg.InterfaceError("connection lost")
+            listening.set()
+
+        def terminate(self):
+            self.terminated = True
+
+        def is_closed(self):
+            return self.terminated
+
+        async def close(self):
+            self.terminated = True
+
+    listening = asyncio.Event()
+    connections = [FakeConnection(fail=True), FakeConnection(fail=False)]
+    opened = iter(connections)
+
+    async def connect(dsn):
+        return next(opened)
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    broker = PostgresChangeBroker("postgresql://user@localhost/todo")
+    broker.RECONNECT_SECONDS = 0
+
+    async def scenario():
+        await broker.start()
+        try:
+            await asyncio.wait_for(listening.wait(), 1)
+        finally:
+            await broker.stop()
+
+    asyncio.run(scenario())
+    assert connections[0].terminated
+    assert connections[1].terminated  # Closed by stop()
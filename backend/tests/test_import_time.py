@@ -0,0 +1,51 @@
+"""Import-time budget for the app, which every cold start pays."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+# Generous for slow CI machines; the app imports in well under a second.
+IMPORT_BUDGET_SECONDS = 2.0
+# Loaded on first use, never at startup
+DEFERRED_MODULES = ("google.generativeai",)
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns:
+        Cumulative import time in microseconds for each module imported
+    """
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite://",
+        "BETTER_AUTH_SECRET": "import-time",
+        "GEMINI_API_KEY": "import-time",
+        "AI_BACKEND": "gemini",
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_within_budget():
+    """Test that the app imports within budget and without deferred modules."""
+    times = import_times("app.main")
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:15]
+    report = "slowest cumulative imports:\n" + "\n".join(
+        f"  {us / 1000:8.1f} ms  {name}" for name, us in slowest
+    )
+
+    assert [m for m in DEFERRED_MODULES if m in times] == []
+    assert times["app.main"] / 1e6 < IMPORT_BUDGET_SECONDS, report
@@ -0,0 +1,121 @@
+"""Tests for request, database and AI metrics."""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import create_engine, text
+
+from app.main import app
+from app.metrics import Counter, Histogram, Registry, instrument_pool
+
+
+def sample(body: str, name: str, **labels: str) -> float:
+    """Return the value of one sample in a metrics response, or 0."""
+    for line in body.splitlines():
+        match = re.match(r"([a-z_]+)(?:\{(.*)\})? (\S+)$", line)
+        if match is None or match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="([^"]*)"', match.group(2) or ""))
+        if all(found.get(k) == v for k, v in labels.items()):
+            return float(match.group(3))
+    return 0.0
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0)))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3, "/a")
+    body = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in body
+    assert sample(body, "latency_seconds_bucket", route="/a", le="0.1") == 1
+    assert sample(body, "latency_seconds_bucket", route="/a", le="1.0") == 2
+    assert sample(body, "latency_seconds_bucket", route="/a", le="+Inf") == 3
+    assert sample(body, "latency_seconds_count", route="/a") == 3
+    assert sample(body, "latency_seconds_sum", route="/a") == pytest.approx(3.55)
+
+
+def test_counter_escapes_label_values():
+    registry = Registry()
+    counter = registry.register(Counter("errors", "Errors.", ("reason",)))
+    counter.inc('bad "quote"')
+    counter.inc('bad "quote"', amount=2)
+
+    assert 'errors_total{reason="bad \\"quote\\""} 3' in registry.render()
+
+
+def test_requests_recorded_by_route_template(client: TestClient):
+    task_id = client.post("/api/tasks", json={"title": "Measure me"}).json()["id"]
+    before = client.get("/metrics").text
+
+    client.get(f"/api/tasks/{task_id}")
+    client.get(f"/api/tasks/{task_id}")
+    body = client.get("/metrics").text
+
+    labels = {"method": "GET", "route": "/api/tasks/{task_id}"}
+    count = "http_request_duration_seconds_count"
+    assert (sample(body, count, status="200", **labels)
+            - sample(before, count, status="200", **labels)) == 2
+    # Query counts are recorded per request under the same labels
+    queries = "http_request_db_queries_sum"
+    assert sample(body, queries, **labels) > sample(before, queries, **labels)
+    assert f"/api/tasks/{task_id}\"" not in body
+
+
+def test_async_route_queries_counted(client: TestClient):
+    before = client.get("/metrics").text
+    client.get("/api/tasks/stats")
+    body = client.get("/metrics").text
+
+    labels = {"method": "GET", "route": "/api/tasks/stats"}
+    queries = "http_request_db_queries_sum"
+    assert sample(body, queries, **labels) - sample(before, queries, **labels) == 1
+
+
+def test_unmatched_paths_share_a_label():
+    client = TestClient(app)
+    client.get("/no/such/path")
+    client.get("/another/missing/path")
+    body = client.get("/metrics").text
+
+    assert sample(body, "http_request_duration_seconds_count",
+                  method="GET", route="unmatched", status="404") >= 2
+    assert "/no/such/path" not in body
+
+
+def test_ai_calls_timed_by_outcome(client: TestClient):
+    before = client.get("/metrics").text
+    client.post("/api/tasks/parse", json={"text": "buy milk tomorrow"})
+    body = client.get("/metrics").text
+
+    name = "ai_call_duration_seconds_count"
+    labels = {"backend": "fake", "outcome": "ok"}
+    assert sample(body, name, **labels) - sample(before, name, **labels) == 1
+
+
+def test_pool_checkouts_and_usage_reported(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db")
+    instrument_pool(engine, "test-pool")
+    client = TestClient(app)
+    before = client.get("/metrics").text
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        during = client.get("/metrics").text
+    body = client.get("/metrics").text
+    engine.dispose()
+
+    name = "db_pool_checkout_seconds_count"
+    assert sample(body, name, pool="test-pool") - sample(before, name, pool="test-pool") == 1
+    assert sample(during, "db_pool_connections", pool="test-pool", state="checked_out") == 1
+    assert sample(body, "db_pool_connections", pool="test-pool", state="checked_out") == 0
+
+
+def test_metrics_content_type():
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
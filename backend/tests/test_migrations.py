@@ -0,0 +1,163 @@
+"""Tests for the versioned migration runner."""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+from sqlmodel.pool import StaticPool
+
+from app.migrations import applied_versions, downgrade, load_migrations, upgrade
+
+# Phase II schema, before any migration ran.
+LEGACY_TASKS = """
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY,
+    user_id VARCHAR NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    description VARCHAR(1000),
+    completed BOOLEAN NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+)
+"""
+
+
+def sqlite_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def postgres_engine():
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS task_categories, tasks, schema_migrations"))
+    return engine
+
+
+@pytest.fixture(name="engine", params=["sqlite", "postgres"])
+def engine_fixture(request):
+    """A database holding a Phase II tasks table and nothing else."""
+    engine = sqlite_engine() if request.param == "sqlite" else postgres_engine()
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_TASKS))
+    yield engine
+    engine.dispose()
+
+
+def test_versions_are_sequential():
+    """Test that migration versions start at 1 with no gaps."""
+    versions = [m.version for m in load_migrations()]
+    assert versions == list(range(1, len(versions) + 1))
+
+
+def test_upgrade_applies_all_and_records_versions(engine):
+    """Test upgrading a legacy schema to the latest version."""
+    latest = load_migrations()[-1].version
+    assert upgrade(engine) == list(range(1, latest + 1))
+    assert applied_versions(engine) == list(range(1, latest + 1))
+
+    inspector = inspect(engine)
+    columns = {c["name"] for c in inspector.get_columns("tasks")}
+    assert {"due_date", "priority", "categories"} <= columns
+    indexes = {i["name"] for i in inspector.get_indexes("tasks")}
+    assert {
+        "ix_tasks_user_completed_created",
+        "ix_tasks_user_due_pending",
+        "ix_tasks_user_updated",
+        "ix_tasks_user_due",
+    } <= indexes
+    assert inspector.has_table("task_suggestions")
+    assert inspector.has_table("task_categories")
+
+    # Running again is a no-op.
+    assert upgrade(engine) == []
+
+
+def test_upgrade_to_target_then_downgrade(engine):
+    """Test stepping up to a version and rolling everything back."""
+    assert upgrade(engine, target=1) == [1]
+    assert applied_versions(engine) == [1]
+
+    upgrade(engine)
+    rolled_back = downgrade(engine, 0)
+    assert rolled_back == sorted(rolled_back, reverse=True)
+    assert applied_versions(engine) == []
+
+    columns = {c["name"] for c in inspect(engine).get_columns("tasks")}
+    assert "due_date" not in columns
+
+
+def test_upgrade_on_create_all_schema():
+    """Test that migrations are no-ops on tables built by create_all."""
+    engine = sqlite_engine()
+    SQLModel.metadata.create_all(engine)
+    latest = load_migrations()[-1].version
+    assert upgrade(engine) == list(range(1, latest + 1))
+
+
+def test_list_query_uses_composite_index():
+    """Test that the filtered task list is served by the composite index."""
+    engine = sqlite_engine()
+    SQLModel.metadata.create_all(engine)
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks "
+            "WHERE user_id = 'u' AND completed = 0 ORDER BY created_at DESC"
+        )).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_tasks_user_completed_created" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_upgrade_backfills_task_categories(engine):
+    """Test that JSON categories are copied into task_categories, normalized."""
+    upgrade(engine, target=4)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO tasks (id, user_id, title, completed, categories, created_at, updated_at) "
+            "VALUES (1, 'u', 'a', false, :a, :now, :now), (2, 'u', 'b', false, :b, :now, :now), "
+            "(3, 'v', 'c', false, NULL, :now, :now)"
+        ), {"a": '["Work", "home", "work"]', "b": '["home"]', "now": "2025-01-01 00:00:00"})
+
+    assert upgrade(engine, target=5) == [5]
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT task_id, category, user_id FROM task_categories ORDER BY task_id, category"
+        )).all()
+    assert [tuple(r) for r in rows] == [(1, "home", "u"), (1, "work", "u"), (2, "home", "u")]
+
+
+def test_category_filter_uses_index():
+    """Test that category filters and facets are answered from the index."""
+    engine = sqlite_engine()
+    SQLModel.metadata.create_all(engine)
+    with engine.connect() as conn:
+        for query in (
+            "SELECT task_id FROM task_categories WHERE user_id = 'u' AND category IN ('a', 'b')",
+            "SELECT category, count(*) FROM task_categories WHERE user_id = 'u' GROUP BY category",
+        ):
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {query}")).all()
+            detail = " ".join(row[-1] for row in plan)
+            assert "COVERING INDEX ix_task_categories_user_category" in detail
+
+
+def test_calendar_query_uses_due_index():
+    """Test that the calendar counts come from a range scan of the due index."""
+    engine = sqlite_engine()
+    SQLModel.metadata.create_all(engine)
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT date(due_date), count(*), "
+            "count(CASE WHEN completed THEN 1 END) FROM tasks "
+            "WHERE user_id = 'u' AND due_date >= '2025-01-01' AND due_date < '2025-02-01' "
+            "GROUP BY date(due_date)"
+        )).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert "COVERING INDEX ix_tasks_user_due" in detail
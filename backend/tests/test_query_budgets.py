@@ -0,0 +1,113 @@
+"""Per-endpoint SQL budgets: fail when a change adds queries to a route."""
+
+from datetime import datetime
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.main import app
+from app.models import Task
+from app.services.task_categories import set_categories
+
+USER_TASKS = 3
+CATEGORIES = ["work", "home", "errands"]
+
+# (method, route) -> (request body, max statements, max rows fetched).
+# Measured on the database path with an empty task cache; ``{task_id}``
+# and ``{second_task_id}`` are the user's. Lower a budget when a route
+# gets cheaper.
+BUDGETS = {
+    ("GET", "/"): (None, 0, 0),
+    ("GET", "/health"): (None, 0, 0),
+    ("GET", "/metrics"): (None, 0, 0),
+    ("GET", "/api/tasks"): (None, 2, 4),
+    ("POST", "/api/tasks"): ({"title": "New"}, 1, 0),
+    ("POST", "/api/tasks/bulk"): ({"operations": [
+        {"op": "create", "task": {"title": "Bulk"}},
+        {"op": "toggle", "id": "{task_id}"},
+        {"op": "update", "id": "{second_task_id}", "changes": {"priority": "high"}},
+    ]}, 5, 4),
+    ("GET", "/api/tasks/task-cache-stats"): (None, 0, 0),
+    ("GET", "/api/tasks/categories"): (None, 1, 3),
+    ("GET", "/api/tasks/calendar"): (None, 1, 3),
+    ("GET", "/api/tasks/{task_id}"): (None, 1, 1),
+    ("PUT", "/api/tasks/{task_id}"): ({"title": "Renamed"}, 1, 1),
+    ("DELETE", "/api/tasks/{task_id}"): (None, 2, 0),
+    ("PATCH", "/api/tasks/{task_id}/complete"): (None, 1, 1),
+    ("POST", "/api/tasks/parse"): ({"text": "buy milk tomorrow"}, 0, 0),
+    ("GET", "/api/tasks/suggestions"): (None, 1, 3),
+    ("POST", "/api/tasks/categorize"): ({"task_ids": ["{task_id}"], "apply": True}, 6, 3),
+    ("POST", "/api/tasks/{task_id}/categorize"): (None, 1, 1),
+    ("GET", "/api/tasks/stats"): (None, 1, 1),
+    ("GET", "/api/tasks/summary"): (None, 2, 4),
+    ("GET", "/api/tasks/cache-stats"): (None, 0, 0),
+}
+
+# Query strings for routes with required parameters
+QUERIES = {
+    ("GET", "/api/tasks/calendar"): "start=2025-01-01&end=2025-01-31",
+}
+
+# Routes that cannot be measured as a single request
+EXEMPT = {
+    ("GET", "/api/tasks/changes"),  # Streams until the client disconnects
+}
+
+
+def fill(value, ids: dict[str, int]):
+    """Substitute task ids into a request body template."""
+    if isinstance(value, str) and value.strip("{}") in ids:
+        return ids[value.strip("{}")]
+    if isinstance(value, dict):
+        return {k: fill(v, ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [fill(v, ids) for v in value]
+    return value
+
+
+@pytest.fixture(name="task_ids")
+def task_ids_fixture(session: Session) -> dict[str, int]:
+    """Give the test user a few categorized tasks and another user one."""
+    tasks = [
+        Task(
+            user_id="test-user-123",
+            title=f"Task {i}",
+            categories=CATEGORIES[: i + 1],
+            due_date=datetime(2025, 1, 1 + i),
+        )
+        for i in range(USER_TASKS)
+    ]
+    session.add_all(tasks + [Task(user_id="other-user", title="Not yours")])
+    session.flush()
+    set_categories(session, "test-user-123", {task.id: task.categories for task in tasks})
+    session.commit()
+    return {"task_id": tasks[0].id, "second_task_id": tasks[1].id}
+
+
+def test_every_route_has_a_budget():
+    routes = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    assert routes - EXEMPT - BUDGETS.keys() == set(), "Declare a budget for new routes"
+    assert BUDGETS.keys() - routes == set(), "Remove budgets for deleted routes"
+
+
+@pytest.mark.parametrize(
+    "method, route", sorted(BUDGETS), ids=[" ".join(key) for key in sorted(BUDGETS)]
+)
+def test_route_within_query_budget(client: TestClient, query_budget, task_ids, method, route):
+    body, statements, rows = BUDGETS[(method, route)]
+
+    url = route.format(**task_ids)
+    if (method, route) in QUERIES:
+        url += "?" + QUERIES[(method, route)]
+
+    with query_budget(statements=statements, rows=rows):
+        response = client.request(method, url, json=fill(body, task_ids))
+
+    assert response.status_code < 400, response.text
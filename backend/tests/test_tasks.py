@@ -1,6 +1,12 @@
 """Tests for task CRUD endpoints."""
 
+from datetime import datetime, timedelta
+
 from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Task
+from app.services.task_cache import MemoryStore, TaskCache, task_cache
 
 
 def test_create_task(client: TestClient):
@@ -17,6 +23,22 @@ def test_create_task(client: TestClient):
     assert data["user_id"] == "test-user-123"
 
 
+def test_created_task_timestamps_match_reads(client: TestClient):
+    """Test that create and bulk create render timestamps as reads do."""
+    created = client.post("/api/tasks", json={"title": "Task"}).json()
+    bulk = client.post(
+        "/api/tasks/bulk", json={"operations": [{"op": "create", "task": {"title": "Bulk"}}]}
+    ).json()["results"][0]["task"]
+
+    for task in (created, bulk):
+        fetched = client.get(f"/api/tasks/{task['id']}").json()
+        assert (task["created_at"], task["updated_at"]) == (
+            fetched["created_at"], fetched["updated_at"]
+        )
+    listed = {item["id"]: item["created_at"] for item in client.get("/api/tasks").json()["items"]}
+    assert listed == {created["id"]: created["created_at"], bulk["id"]: bulk["created_at"]}
+
+
 def test_list_tasks(client: TestClient):
     """Test listing tasks."""
     # Create two tasks
@@ -26,7 +48,8 @@ def test_list_tasks(client: TestClient):
     response = client.get("/api/tasks")
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 2
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is None
 
 
 def test_list_tasks_filter_pending(client: TestClient):
@@ -39,7 +62,37 @@ def test_list_tasks_filter_pending(client: TestClient):
     response = client.get("/api/tasks?status=pending")
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 1
+    assert len(data["items"]) == 1
+
+
+def test_list_tasks_cursor_pagination(client: TestClient):
+    """Test walking the task list page by page with next_cursor."""
+    for i in range(5):
+        client.post("/api/tasks", json={"title": f"Task {i}"})
+
+    titles = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/api/tasks", params=params).json()
+        assert data["limit"] == 2
+        titles.extend(item["title"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert titles == [f"Task {i}" for i in reversed(range(5))]
+
+
+def test_list_tasks_invalid_cursor(client: TestClient):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/tasks?cursor=not-a-cursor")
+    assert response.status_code == 400
 
 
 def test_get_task(client: TestClient):
@@ -116,3 +169,292 @@ def test_unauthorized_no_token():
     raw_client = TC(app)
     response = raw_client.get("/api/tasks")
     assert response.status_code in (401, 403)
+
+
+def test_bulk_operations(client: TestClient, session: Session):
+    """Test mixed bulk operations and their per-operation results."""
+    ids = [client.post("/api/tasks", json={"title": f"Task {i}"}).json()["id"] for i in range(4)]
+    other = Task(user_id="someone-else", title="Not yours")
+    session.add(other)
+    session.commit()
+
+    response = client.post(
+        "/api/tasks/bulk",
+        json={"operations": [
+            {"op": "create", "task": {"title": "New", "priority": "high"}},
+            {"op": "update", "id": ids[0], "changes": {"title": "Renamed"}},
+            {"op": "toggle", "id": ids[1]},
+            {"op": "toggle", "id": ids[2], "completed": False},
+            {"op": "delete", "id": ids[3]},
+            {"op": "delete", "id": other.id},
+            {"op": "toggle", "id": 9999},
+        ]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [201, 200, 200, 200, 204, 403, 404]
+    assert results[0]["task"]["title"] == "New"
+    assert results[1]["task"]["title"] == "Renamed"
+    assert results[1]["task"]["description"] is None
+    assert results[2]["task"]["completed"] is True
+    assert results[3]["task"]["completed"] is False
+
+    assert client.get(f"/api/tasks/{ids[3]}").status_code == 404
+    assert client.get(f"/api/tasks/{results[0]['id']}").json()["priority"] == "high"
+    assert session.get(Task, other.id) is not None
+
+
+def test_bulk_rejects_duplicate_ids(client: TestClient):
+    """Test that a task may only appear once per bulk request."""
+    task_id = client.post("/api/tasks", json={"title": "Task"}).json()["id"]
+    response = client.post(
+        "/api/tasks/bulk",
+        json={"operations": [
+            {"op": "toggle", "id": task_id},
+            {"op": "delete", "id": task_id},
+        ]},
+    )
+    assert response.status_code == 400
+
+
+def test_mutations_keep_404_and_403(client: TestClient, session: Session):
+    """Test that ownership-scoped writes still tell missing from foreign tasks."""
+    other = Task(user_id="someone-else", title="Not yours")
+    session.add(other)
+    session.commit()
+
+    for method, path, body in [
+        ("put", "/api/tasks/{}", {"title": "Mine now"}),
+        ("patch", "/api/tasks/{}/complete", None),
+        ("delete", "/api/tasks/{}", None),
+    ]:
+        response = client.request(method, path.format(other.id), json=body)
+        assert response.status_code == 403
+        response = client.request(method, path.format(9999), json=body)
+        assert response.status_code == 404
+
+    session.refresh(other)
+    assert other.title == "Not yours"
+    assert other.completed is False
+
+
+def test_toggle_is_one_statement(client: TestClient, count_queries):
+    """Test that toggling issues a single UPDATE ... RETURNING."""
+    task_id = client.post("/api/tasks", json={"title": "Task"}).json()["id"]
+
+    with count_queries() as count:
+        response = client.patch(f"/api/tasks/{task_id}/complete")
+
+    assert response.json() == {"id": task_id, "completed": True}
+    assert len(count.statements) == 1
+    assert "RETURNING" in count.statements[0]
+
+
+def test_update_without_returning(client: TestClient, session: Session, monkeypatch):
+    """Test the UPDATE-then-SELECT fallback for backends without RETURNING."""
+    task_id = client.post("/api/tasks", json={"title": "Task"}).json()["id"]
+    monkeypatch.setattr(session.get_bind().dialect, "update_returning", False)
+
+    response = client.put(f"/api/tasks/{task_id}", json={"priority": "low"})
+    assert response.status_code == 200
+    assert response.json()["priority"] == "low"
+    assert client.patch(f"/api/tasks/{task_id}/complete").json()["completed"] is True
+
+
+def test_list_conditional_get(client: TestClient, count_queries):
+    """Test that an unchanged list answers If-None-Match with 304."""
+    task_id = client.post("/api/tasks", json={"title": "Task"}).json()["id"]
+    first = client.get("/api/tasks")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    task_cache.clear()  # Measure the database path
+
+    with count_queries() as count:
+        cached = client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert len(count.statements) == 1
+
+    assert client.get("/api/tasks?status=pending").headers["ETag"] != etag
+    client.patch(f"/api/tasks/{task_id}/complete")
+    assert client.get("/api/tasks", headers={"If-None-Match": etag}).status_code == 200
+    client.delete(f"/api/tasks/{task_id}")
+    assert client.get("/api/tasks").headers["ETag"] != etag
+
+
+def test_get_task_conditional_get(client: TestClient):
+    """Test ETags on the task detail endpoint."""
+    task_id = client.post("/api/tasks", json={"title": "Task"}).json()["id"]
+    etag = client.get(f"/api/tasks/{task_id}").headers["ETag"]
+
+    response = client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    client.put(f"/api/tasks/{task_id}", json={"title": "Changed"})
+    response = client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Changed"
+
+
+def test_reads_are_cached_until_a_write(client: TestClient, count_queries, monkeypatch):
+    """Test that repeat reads skip the database and writes invalidate them."""
+    monkeypatch.setattr(task_cache, "store", MemoryStore())
+    task_id = client.post("/api/tasks", json={"title": "Task"}).json()["id"]
+    first = client.get("/api/tasks")
+    client.get(f"/api/tasks/{task_id}")
+
+    with count_queries() as count:
+        again = client.get("/api/tasks")
+        detail = client.get(f"/api/tasks/{task_id}")
+    assert count.statements == []
+    assert again.json() == first.json()
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert detail.json()["title"] == "Task"
+
+    client.put(f"/api/tasks/{task_id}", json={"title": "Renamed"})
+    assert client.get("/api/tasks").json()["items"][0]["title"] == "Renamed"
+    assert client.get(f"/api/tasks/{task_id}").json()["title"] == "Renamed"
+
+    stats = client.get("/api/tasks/task-cache-stats").json()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["hit_rate"] == 2 / 6
+
+
+def test_task_cache_generation_survives_eviction():
+    """Test that losing a user's generation token never revives old entries."""
+    store = MemoryStore(max_entries=3)
+    cache = TaskCache(store)
+    keys = []
+    for value in (["old"], ["new"]):
+        cache.invalidate("user-1")
+        _, generation = cache.get("user-1", "list")
+        cache.set("user-1", generation, "list", value)
+        keys.append(f"tasks:user-1:{generation}:list")
+
+    # Evict the current token while both data entries stay behind.
+    for key in keys:
+        store.get(key)
+    cache.get("user-2", "list")
+    assert store.get("gen:user-1") is None
+
+    assert cache.get("user-1", "list")[0] is None
+
+
+def test_task_cache_invalidation_shared_across_workers():
+    """Test that a write on one worker hides its cached reads on another."""
+    store = MemoryStore()  # Stands in for the shared Redis both pods use
+    pod_a, pod_b = TaskCache(store), TaskCache(store)
+    _, generation = pod_b.get("user-1", "list")
+    pod_b.set("user-1", generation, "list", ["before"])
+    assert pod_b.get("user-1", "list")[0] == ["before"]
+
+    pod_a.invalidate("user-1")
+
+    assert pod_b.get("user-1", "list")[0] is None
+
+
+def test_filter_by_category(client: TestClient):
+    """Test any-of and all-of category filters on the task list."""
+    ids = {
+        title: client.post("/api/tasks", json={"title": title, "categories": categories}).json()["id"]
+        for title, categories in [
+            ("Report", ["Work"]),
+            ("Fix sink", ["home", "errands"]),
+            ("Buy paint", ["home", "shopping"]),
+            ("No tags", None),
+        ]
+    }
+
+    def titles(query: str) -> set[str]:
+        return {t["title"] for t in client.get(f"/api/tasks?{query}").json()["items"]}
+
+    assert titles("category=work") == {"Report"}
+    assert titles("category=home&category=WORK") == {"Report", "Fix sink", "Buy paint"}
+    assert titles("category=home&category=errands&category_match=all") == {"Fix sink"}
+    assert titles("category=nothing") == set()
+    assert client.get("/api/tasks?category=x&category_match=some").status_code == 422
+
+    client.put(f"/api/tasks/{ids['Report']}", json={"categories": ["home"]})
+    assert titles("category=work") == set()
+    client.delete(f"/api/tasks/{ids['Fix sink']}")
+    assert titles("category=home") == {"Report", "Buy paint"}
+
+
+def test_category_facets(client: TestClient):
+    """Test per-category task counts, optionally by status."""
+    done = client.post("/api/tasks", json={"title": "A", "categories": ["work"]}).json()["id"]
+    client.post("/api/tasks", json={"title": "B", "categories": ["work", "home"]})
+    client.post("/api/tasks/bulk", json={"operations": [
+        {"op": "create", "task": {"title": "C", "categories": ["Home", "travel"]}},
+    ]})
+    client.patch(f"/api/tasks/{done}/complete")
+
+    assert client.get("/api/tasks/categories").json() == {"categories": [
+        {"category": "home", "count": 2},
+        {"category": "work", "count": 2},
+        {"category": "travel", "count": 1},
+    ]}
+    pending = client.get("/api/tasks/categories?status=pending").json()["categories"]
+    assert {c["category"]: c["count"] for c in pending} == {"home": 2, "work": 1, "travel": 1}
+
+
+def test_filter_by_due_date(client: TestClient):
+    """Test due-date range, overdue and due-within filters."""
+    now = datetime.now()
+    due = {
+        "Yesterday": now - timedelta(days=1),
+        "Done late": now - timedelta(days=2),
+        "In two days": now + timedelta(days=2),
+        "Next month": now + timedelta(days=30),
+        "Someday": None,
+    }
+    for title, due_date in due.items():
+        client.post("/api/tasks", json={
+            "title": title, "due_date": due_date.isoformat() if due_date else None,
+        })
+    done = next(t for t in client.get("/api/tasks").json()["items"] if t["title"] == "Done late")
+    client.patch(f"/api/tasks/{done['id']}/complete")
+
+    def titles(query: str) -> set[str]:
+        return {t["title"] for t in client.get(f"/api/tasks?{query}").json()["items"]}
+
+    assert titles("overdue=true") == {"Yesterday"}
+    assert titles("due_within_days=7") == {"In two days"}
+    after = (now - timedelta(days=3)).isoformat()
+    before = (now + timedelta(days=3)).isoformat()
+    assert titles(f"due_after={after}&due_before={before}") == {
+        "Yesterday", "Done late", "In two days",
+    }
+    assert titles(f"due_after={after}&due_before={before}&status=completed") == {"Done late"}
+    assert client.get("/api/tasks?due_within_days=-1").status_code == 422
+
+
+def test_calendar_counts_per_day(client: TestClient, session: Session):
+    """Test per-day due counts over a date range."""
+    for title, due_date, completed in [
+        ("A", datetime(2025, 3, 1, 9), False),
+        ("B", datetime(2025, 3, 1, 18), True),
+        ("C", datetime(2025, 3, 3, 12), False),
+        ("Outside", datetime(2025, 4, 1, 12), False),
+        ("Undated", None, False),
+    ]:
+        session.add(Task(user_id="test-user-123", title=title, due_date=due_date, completed=completed))
+    session.add(Task(user_id="other-user", title="Not yours", due_date=datetime(2025, 3, 1)))
+    session.commit()
+
+    response = client.get("/api/tasks/calendar?start=2025-03-01&end=2025-03-31")
+    assert response.status_code == 200
+    assert response.json() == {
+        "start": "2025-03-01",
+        "end": "2025-03-31",
+        "days": [
+            {"date": "2025-03-01", "total": 2, "completed": 1},
+            {"date": "2025-03-03", "total": 1, "completed": 0},
+        ],
+    }
+    # end is inclusive
+    days = client.get("/api/tasks/calendar?start=2025-04-01&end=2025-04-01").json()["days"]
+    assert days == [{"date": "2025-04-01", "total": 1, "completed": 0}]
+    assert client.get("/api/tasks/calendar?start=2025-03-02&end=2025-03-01").status_code == 400
+    assert client.get("/api/tasks/calendar?start=2025-01-01&end=2026-06-01").status_code == 400
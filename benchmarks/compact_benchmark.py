@@ -0,0 +1,88 @@
+"""Compare memory use and throughput of the task storage backends.
+
+Usage:
+    PYTHONPATH=src python benchmarks/compact_benchmark.py [size ...]
+
+For each size, fills ``TaskStorage`` and ``CompactTaskStorage`` twice: once
+with titles drawn from a small pool (as repeated chores are) and once with
+every title unique, the worst case for string sharing. Reports bytes per
+task measured with ``tracemalloc`` and the cost of add, get_by_id,
+toggle_complete and a full iteration.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from itertools import product
+
+from todo.compact import CompactTaskStorage
+from todo.storage import TaskStorage
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+TITLES = [f"{verb} {noun}" for verb in ("Buy", "Call", "Fix", "Review", "Plan")
+          for noun in ("milk", "report", "car", "invoice", "trip", "bug")]
+OPS = 10_000
+STORES = [("dict", TaskStorage), ("compact", CompactTaskStorage)]
+
+
+def fill(store_cls: type, size: int, unique: bool = False) -> object:
+    """Build a store of ``size`` tasks.
+
+    Each title is a fresh string object, as it would be when read from
+    input or a file, so duplicate titles are only shared if the store
+    deduplicates them. With ``unique`` every title differs.
+    """
+    rng = random.Random(size)
+    store = store_cls()
+    for number in range(size):
+        title = rng.choice(TITLES)
+        store.add(f"{title} #{number}" if unique else title.encode().decode())
+    return store
+
+
+def measure_memory(store_cls: type, size: int, unique: bool) -> float:
+    """Return bytes allocated per task while filling a store."""
+    tracemalloc.start()
+    store = fill(store_cls, size, unique)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return used / size
+
+
+def time_op(func, ids: list[int]) -> float:
+    """Return mean microseconds per call of ``func`` over ``ids``."""
+    start = time.perf_counter()
+    for task_id in ids:
+        func(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main(sizes: list[int]) -> None:
+    """Run the benchmark for each size and print a table."""
+    print(f"{'store':<8} {'titles':<7} {'size':>9} {'bytes/task':>11} "
+          f"{'add us':>8} {'get us':>8} {'toggle us':>10} {'iter ms':>9}")
+    for size in sizes:
+        for unique, (label, store_cls) in product((False, True), STORES):
+            titles = "unique" if unique else "pooled"
+            per_task = measure_memory(store_cls, size, unique)
+            start = time.perf_counter()
+            store = fill(store_cls, size, unique)
+            add_us = (time.perf_counter() - start) / size * 1e6
+            rng = random.Random(size)
+            ids = [rng.randint(1, size) for _ in range(min(OPS, size))]
+            get_us = time_op(store.get_by_id, ids)
+            toggle_us = time_op(store.toggle_complete, ids)
+            start = time.perf_counter()
+            for _ in store:
+                pass
+            iter_ms = (time.perf_counter() - start) * 1e3
+            print(f"{label:<8} {titles:<7} {size:>9} {per_task:>11.1f} "
+                  f"{add_us:>8.2f} {get_us:>8.2f} {toggle_us:>10.2f} "
+                  f"{iter_ms:>9.1f}", flush=True)
+            del store
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,115 @@
+"""Benchmark TaskStorage lookups and mutations against the old list store.
+
+Usage:
+    PYTHONPATH=src python benchmarks/storage_benchmark.py [size ...]
+
+For each store size, times ``get_by_id``, ``update``, ``toggle_complete``
+and ``delete`` on random IDs and prints the mean cost per operation. The
+list-based store is only run up to 100k tasks; beyond that it takes minutes.
+"""
+
+import random
+import sys
+import time
+
+from todo.models import Task
+from todo.storage import TaskStorage
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+LIST_STORE_MAX = 100_000
+OPS = 2_000
+
+
+class ListTaskStorage:
+    """The original list-backed storage, kept here as a baseline."""
+
+    def __init__(self) -> None:
+        self._tasks: list[Task] = []
+        self._next_id: int = 1
+
+    def add(self, title: str, description: str = "") -> Task:
+        task = Task(id=self._next_id, title=title, description=description)
+        self._tasks.append(task)
+        self._next_id += 1
+        return task
+
+    def get_by_id(self, task_id: int) -> Task | None:
+        for task in self._tasks:
+            if task.id == task_id:
+                return task
+        return None
+
+    def update(self, task_id: int, title: str | None = None,
+               description: str | None = None) -> Task | None:
+        task = self.get_by_id(task_id)
+        if task is None:
+            return None
+        if title is not None:
+            task.title = title
+        if description is not None:
+            task.description = description
+        return task
+
+    def delete(self, task_id: int) -> Task | None:
+        task = self.get_by_id(task_id)
+        if task is None:
+            return None
+        self._tasks.remove(task)
+        return task
+
+    def toggle_complete(self, task_id: int) -> Task | None:
+        task = self.get_by_id(task_id)
+        if task is None:
+            return None
+        task.completed = not task.completed
+        return task
+
+
+def time_op(func, ids: list[int]) -> float:
+    """Return mean microseconds per call of ``func`` over ``ids``."""
+    start = time.perf_counter()
+    for task_id in ids:
+        func(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def bench(store_cls: type, size: int) -> dict[str, float]:
+    """Fill a store with ``size`` tasks and time each operation."""
+    store = store_cls()
+    for i in range(size):
+        store.add(f"Task {i}")
+
+    rng = random.Random(size)
+    ops = min(OPS, size)
+    ids = [rng.randint(1, size) for _ in range(ops)]
+    doomed = rng.sample(range(1, size + 1), ops)
+
+    return {
+        "get_by_id": time_op(store.get_by_id, ids),
+        "update": time_op(lambda i: store.update(i, title="Renamed"), ids),
+        "toggle": time_op(store.toggle_complete, ids),
+        "delete": time_op(store.delete, doomed),
+    }
+
+
+def main(sizes: list[int]) -> None:
+    """Run the benchmark for each size and print a table."""
+    header = f"{'store':<8} {'size':>10}"
+    for name in ("get_by_id", "update", "toggle", "delete"):
+        header += f" {name + ' us':>14}"
+    print(header)
+
+    for size in sizes:
+        for label, store_cls in (("list", ListTaskStorage),
+                                 ("indexed", TaskStorage)):
+            if store_cls is ListTaskStorage and size > LIST_STORE_MAX:
+                continue
+            results = bench(store_cls, size)
+            row = f"{label:<8} {size:>10}"
+            for value in results.values():
+                row += f" {value:>14.3f}"
+            print(row, flush=True)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
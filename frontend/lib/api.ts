@@ -22,6 +22,34 @@ export interface TaskListItem {
   created_at: string;
 }
 
+export interface TaskListPage {
+  items: TaskListItem[];
+  next_cursor: string | null;
+  limit: number;
+}
+
+export type TaskStatusFilter = "all" | "pending" | "completed";
+
+export interface TaskFilter {
+  categories?: string[];
+  match?: "any" | "all";
+  dueAfter?: string; // ISO datetime, inclusive
+  dueBefore?: string; // ISO datetime, exclusive
+  overdue?: boolean;
+  dueWithinDays?: number;
+}
+
+export interface CalendarDay {
+  date: string; // YYYY-MM-DD
+  total: number;
+  completed: number;
+}
+
+export interface CategoryCount {
+  category: string;
+  count: number;
+}
+
 export interface CreateTaskData {
   title: string;
   description?: string;
@@ -39,6 +67,30 @@ export interface UpdateTaskData {
 }
 
 // AI Types
+export type BulkOperation =
+  | { op: "create"; task: CreateTaskData }
+  | { op: "update"; id: number; changes: UpdateTaskData }
+  | { op: "delete"; id: number }
+  | { op: "toggle"; id: number; completed?: boolean };
+
+export interface BulkResult {
+  op: BulkOperation["op"];
+  id: number | null;
+  status: number;
+  task: Task | null;
+  detail: string | null;
+}
+
+export type TaskChange =
+  | { id: string; type: "upsert"; task_id: number; task: Task }
+  | { id: string; type: "delete"; task_id: number; task: null };
+
+export interface ChangeHandlers {
+  onChange: (change: TaskChange) => void;
+  // The stream cannot replay what was missed: reload the task list.
+  onReset: () => void;
+}
+
 export interface ParsedTask {
   title: string;
   description: string | null;
@@ -64,6 +116,13 @@ export interface TaskSummary {
   stats: SummaryStats;
 }
 
+export interface BatchCategorizeResult {
+  results: { task_id: number; categories: string[] }[];
+  not_found: number[];
+  failed: number[];
+  applied: boolean;
+}
+
 class ApiClient {
   private token: string | null = null;
 
@@ -105,8 +164,59 @@ class ApiClient {
     return response.json();
   }
 
-  async getTasks(status: "all" | "pending" | "completed" = "all"): Promise<TaskListItem[]> {
-    return this.request<TaskListItem[]>(`/api/tasks?status=${status}`);
+  async getTaskPage(
+    status: TaskStatusFilter = "all",
+    cursor: string | null = null,
+    limit = 200,
+    filter: TaskFilter = {}
+  ): Promise<TaskListPage> {
+    const params = new URLSearchParams({ status, limit: String(limit) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    if (filter.categories?.length) {
+      filter.categories.forEach((category) => params.append("category", category));
+      params.set("category_match", filter.match ?? "any");
+    }
+    if (filter.dueAfter) params.set("due_after", filter.dueAfter);
+    if (filter.dueBefore) params.set("due_before", filter.dueBefore);
+    if (filter.overdue) params.set("overdue", "true");
+    if (filter.dueWithinDays !== undefined) {
+      params.set("due_within_days", String(filter.dueWithinDays));
+    }
+    return this.request<TaskListPage>(`/api/tasks?${params}`);
+  }
+
+  async getTasks(
+    status: TaskStatusFilter = "all",
+    filter: TaskFilter = {}
+  ): Promise<TaskListItem[]> {
+    const tasks: TaskListItem[] = [];
+    let cursor: string | null = null;
+    do {
+      const page: TaskListPage = await this.getTaskPage(status, cursor, 200, filter);
+      tasks.push(...page.items);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return tasks;
+  }
+
+  // Per-day due counts from start through end (YYYY-MM-DD, inclusive);
+  // days without tasks are omitted.
+  async getCalendar(start: string, end: string): Promise<CalendarDay[]> {
+    const params = new URLSearchParams({ start, end });
+    const calendar = await this.request<{ days: CalendarDay[] }>(
+      `/api/tasks/calendar?${params}`
+    );
+    return calendar.days;
+  }
+
+  async getCategories(status: TaskStatusFilter = "all"): Promise<CategoryCount[]> {
+    const params = new URLSearchParams({ status });
+    const facets = await this.request<{ categories: CategoryCount[] }>(
+      `/api/tasks/categories?${params}`
+    );
+    return facets.categories;
   }
 
   async getTask(id: number): Promise<Task> {
@@ -140,6 +250,68 @@ class ApiClient {
     );
   }
 
+  async bulk(operations: BulkOperation[]): Promise<BulkResult[]> {
+    const response = await this.request<{ results: BulkResult[] }>("/api/tasks/bulk", {
+      method: "POST",
+      body: JSON.stringify({ operations }),
+    });
+    return response.results;
+  }
+
+  /**
+   * Stream task changes over Server-Sent Events, reconnecting and resuming
+   * from the last event seen. Uses fetch rather than EventSource so the
+   * bearer token can be sent. Returns a function that closes the stream.
+   */
+  subscribeToChanges(handlers: ChangeHandlers): () => void {
+    const controller = new AbortController();
+    let lastEventId: string | null = null;
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const headers: Record<string, string> = {};
+          if (this.token) headers["Authorization"] = `Bearer ${this.token}`;
+          if (lastEventId) headers["Last-Event-ID"] = lastEventId;
+          const response = await fetch(`${API_URL}/api/tasks/changes`, {
+            headers,
+            signal: controller.signal,
+          });
+          if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = "";
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            let end: number;
+            while ((end = buffer.indexOf("\n\n")) !== -1) {
+              const message = buffer.slice(0, end);
+              buffer = buffer.slice(end + 2);
+              const event = message.match(/^event: (.*)$/m)?.[1];
+              const data = message.match(/^data: (.*)$/m)?.[1];
+              if (event === "reset") {
+                lastEventId = null;
+                handlers.onReset();
+              } else if (event === "change" && data) {
+                const change = JSON.parse(data) as TaskChange;
+                lastEventId = change.id;
+                handlers.onChange(change);
+              }
+            }
+          }
+        } catch {
+          if (controller.signal.aborted) return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+      }
+    };
+
+    connect();
+    return () => controller.abort();
+  }
+
   // AI Endpoints
   async parseTask(text: string): Promise<ParsedTask> {
     return this.request<ParsedTask>("/api/tasks/parse", {
@@ -158,6 +330,20 @@ class ApiClient {
     });
   }
 
+  async categorizeTasks(
+    taskIds: number[],
+    apply = false
+  ): Promise<BatchCategorizeResult> {
+    return this.request<BatchCategorizeResult>("/api/tasks/categorize", {
+      method: "POST",
+      body: JSON.stringify({ task_ids: taskIds, apply }),
+    });
+  }
+
+  async getStats(): Promise<SummaryStats> {
+    return this.request<SummaryStats>("/api/tasks/stats");
+  }
+
   async getSummary(): Promise<TaskSummary> {
     return this.request<TaskSummary>("/api/tasks/summary");
   }
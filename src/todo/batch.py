@@ -0,0 +1,167 @@
+"""Streaming JSONL/CSV import and export for the console app."""
+
+import csv
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, TextIO
+
+from todo.models import Task
+from todo.persistence import task_to_record
+from todo.storage import TaskStore
+
+FORMATS = ("jsonl", "csv")
+CSV_FIELDS = ["id", "title", "description", "completed", "created_at"]
+MAX_TITLE_LENGTH = 200
+MAX_DESCRIPTION_LENGTH = 1000
+MAX_REPORTED_ERRORS = 20
+_TRUE = {"1", "true", "yes", "y", "x"}
+_FALSE = {"", "0", "false", "no", "n"}
+
+
+def detect_format(path: str, fmt: str | None = None) -> str:
+    """Return ``fmt`` if given, else infer it from the file extension."""
+    if fmt:
+        return fmt
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if path.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path!r}; pass --format")
+
+
+@contextmanager
+def open_text(path: str, mode: str) -> Iterator[TextIO]:
+    """Open ``path`` for text I/O, treating ``-`` as stdin/stdout."""
+    if path == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+        return
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        yield f
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"invalid completed value {value!r}")
+
+
+def to_record(raw: dict[str, Any]) -> dict[str, Any]:
+    """Validate one input row and convert it to a storage record.
+
+    Applies the same limits as the interactive menu. Any ``id`` column is
+    ignored; the store assigns IDs on import.
+    """
+    title = (raw.get("title") or "").strip()
+    if not title:
+        raise ValueError("title cannot be empty")
+    if len(title) > MAX_TITLE_LENGTH:
+        raise ValueError(f"title cannot exceed {MAX_TITLE_LENGTH} characters")
+    description = (raw.get("description") or "").strip()
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        raise ValueError(
+            f"description cannot exceed {MAX_DESCRIPTION_LENGTH} characters"
+        )
+    created_at = raw.get("created_at")
+    if created_at:
+        created_at = datetime.fromisoformat(created_at)
+        if created_at.tzinfo is not None:
+            # The console app works in naive local time.
+            created_at = created_at.astimezone().replace(tzinfo=None)
+    return {
+        "title": title,
+        "description": description,
+        "completed": _parse_bool(raw.get("completed", False)),
+        "created_at": created_at or None,
+    }
+
+
+def _raw_rows(f: TextIO, fmt: str) -> Iterator[tuple[int, Any]]:
+    """Yield ``(line number, row)`` pairs; JSONL rows are still unparsed."""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(f, start=1):
+        if line.strip():
+            yield line_no, line
+
+
+def read_tasks(
+    f: TextIO, fmt: str, on_error: Callable[[str], None] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield storage records from a JSONL or CSV stream, one at a time.
+
+    Invalid rows are skipped and reported to ``on_error`` when it is given.
+    """
+    for line_no, raw in _raw_rows(f, fmt):
+        try:
+            if isinstance(raw, str):
+                raw = json.loads(raw)
+            yield to_record(raw)
+        except (ValueError, TypeError, AttributeError) as e:
+            if on_error is not None:
+                on_error(f"line {line_no}: {e}")
+
+
+def write_tasks(f: TextIO, tasks: Iterable[Task], fmt: str) -> int:
+    """Stream tasks to ``f`` as JSONL or CSV and return how many were written."""
+    count = 0
+
+    def records() -> Iterator[dict[str, Any]]:
+        nonlocal count
+        for task in tasks:
+            count += 1
+            yield task_to_record(task)
+
+    if fmt == "csv":
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(records())
+    else:
+        f.writelines(
+            json.dumps(record, ensure_ascii=False) + "\n"
+            for record in records()
+        )
+    return count
+
+
+def import_tasks(storage: TaskStore, path: str,
+                 fmt: str | None = None) -> tuple[int, int, list[str]]:
+    """Bulk-load a task file into ``storage``.
+
+    Returns the number of tasks imported, the number of rows skipped and
+    the messages for the first ``MAX_REPORTED_ERRORS`` skipped rows.
+    """
+    fmt = detect_format(path, fmt)
+    skipped = 0
+    errors: list[str] = []
+
+    def on_error(message: str) -> None:
+        nonlocal skipped
+        skipped += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(message)
+
+    with open_text(path, "r") as f:
+        added = storage.add_many(read_tasks(f, fmt, on_error))
+    return added, skipped, errors
+
+
+def export_tasks(storage: TaskStore, path: str, fmt: str | None = None,
+                 completed: bool | None = None) -> int:
+    """Write tasks from ``storage`` to a file, optionally filtered by status."""
+    fmt = detect_format(path, fmt)
+    tasks: Iterable[Task] = storage
+    if completed is not None:
+        tasks = (task for task in storage if task.completed == completed)
+    with open_text(path, "w") as f:
+        return write_tasks(f, tasks, fmt)
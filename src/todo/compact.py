@@ -0,0 +1,233 @@
+"""Column-oriented task storage for very large in-memory task sets."""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from typing import Any
+
+from todo.models import Task
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_COMPLETED = 0x01
+_DELETED = 0x02
+
+
+def _to_micros(dt: datetime) -> int:
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+class CompactTaskStorage:
+    """Task storage that keeps each field in its own column.
+
+    Offers the same API as ``TaskStorage`` but stores no per-task objects:
+    IDs map directly to row numbers (``row = id - 1``), completion and
+    deletion are bits in a ``bytearray``, ``created_at`` is an ``array`` of
+    epoch microseconds, and equal titles/descriptions share one string
+    object through a reference-counted pool.
+    ``Task`` objects are built only when a caller asks for one, so they are
+    snapshots: change tasks through ``update``/``toggle_complete``, not by
+    assigning to the returned object.
+
+    Deleted rows keep their slot (IDs are never reused) but release their
+    strings, costing about 17 bytes each.
+    """
+
+    def __init__(self) -> None:
+        self._flags = bytearray()
+        self._created = array("q")
+        self._titles: list[str] = []
+        self._descriptions: list[str] = []
+        self._live = 0
+        self._completed = 0
+        self._created_sorted = True
+        # Canonical copy of each stored string and how many cells hold it.
+        self._strings: dict[str, str] = {}
+        self._refs: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __iter__(self) -> Iterator[Task]:
+        flags = self._flags
+        for row in range(len(flags)):
+            if not flags[row] & _DELETED:
+                yield self._task(row)
+
+    def __contains__(self, task_id: object) -> bool:
+        return isinstance(task_id, int) and self._row(task_id) is not None
+
+    def _row(self, task_id: int) -> int | None:
+        """Return the row for a live task ID, or None."""
+        row = task_id - 1
+        if 0 <= row < len(self._flags) and not self._flags[row] & _DELETED:
+            return row
+        return None
+
+    def _share(self, text: str) -> str:
+        """Return the pooled copy of ``text``, counting one more holder."""
+        if not text:
+            return ""
+        shared = self._strings.setdefault(text, text)
+        self._refs[shared] = self._refs.get(shared, 0) + 1
+        return shared
+
+    def _release(self, text: str) -> None:
+        """Drop one holder of a pooled string, freeing it with the last."""
+        if not text:
+            return
+        refs = self._refs[text] - 1
+        if refs:
+            self._refs[text] = refs
+        else:
+            del self._refs[text]
+            del self._strings[text]
+
+    def _task(self, row: int) -> Task:
+        """Materialize a ``Task`` view of one row."""
+        return Task(
+            id=row + 1,
+            title=self._titles[row],
+            description=self._descriptions[row],
+            completed=bool(self._flags[row] & _COMPLETED),
+            created_at=_from_micros(self._created[row]),
+        )
+
+    def add(self, title: str, description: str = "") -> Task:
+        """Create a new task and return a view of it."""
+        micros = _to_micros(datetime.now())
+        if self._created and micros < self._created[-1]:
+            self._created_sorted = False
+        self._flags.append(0)
+        self._created.append(micros)
+        self._titles.append(self._share(title))
+        self._descriptions.append(self._share(description))
+        self._live += 1
+        return self._task(len(self._flags) - 1)
+
+    def add_many(self, records: Iterable[dict[str, Any]]) -> int:
+        """Insert tasks in bulk and return how many were added.
+
+        Takes the same records as ``TaskStorage.add_many``.
+        """
+        flags = self._flags
+        created = self._created
+        titles = self._titles
+        descriptions = self._descriptions
+        share = self._share
+        last = created[-1] if created else None
+        added = completed = 0
+        try:
+            for record in records:
+                title = record["title"]
+                description = record.get("description") or ""
+                done = bool(record.get("completed", False))
+                micros = _to_micros(record.get("created_at") or datetime.now())
+                if last is not None and micros < last:
+                    self._created_sorted = False
+                last = micros
+                flags.append(_COMPLETED if done else 0)
+                created.append(micros)
+                titles.append(share(title))
+                descriptions.append(share(description))
+                added += 1
+                completed += done
+        finally:
+            self._live += added
+            self._completed += completed
+        return added
+
+    def get_all(self) -> list[Task]:
+        """Return all tasks."""
+        return list(self)
+
+    def get_by_id(self, task_id: int) -> Task | None:
+        """Find task by ID, returns None if not found."""
+        row = self._row(task_id)
+        return None if row is None else self._task(row)
+
+    def get_by_status(self, completed: bool) -> list[Task]:
+        """Return all completed or all pending tasks."""
+        return list(self.iter_tasks(completed))
+
+    def iter_tasks(self, completed: bool | None = None) -> Iterator[Task]:
+        """Iterate tasks in ID order, optionally filtered by status."""
+        if completed is None:
+            yield from self
+            return
+        flags = self._flags
+        wanted = bytes([_COMPLETED if completed else 0])
+        row = flags.find(wanted)
+        while row != -1:
+            yield self._task(row)
+            row = flags.find(wanted, row + 1)
+
+    def count(self, completed: bool | None = None) -> int:
+        """Count tasks, optionally only those with the given status."""
+        if completed is None:
+            return self._live
+        return self._completed if completed else self._live - self._completed
+
+    def get_created_between(self, start: datetime | None = None,
+                            end: datetime | None = None) -> list[Task]:
+        """Return tasks created in ``[start, end)``, oldest first."""
+        created = self._created
+        lo_us = None if start is None else _to_micros(start)
+        hi_us = None if end is None else _to_micros(end)
+        if self._created_sorted:
+            lo = 0 if lo_us is None else bisect_left(created, lo_us)
+            hi = len(created) if hi_us is None else bisect_left(created, hi_us)
+            rows = range(lo, hi)
+        else:
+            rows = sorted(
+                (row for row in range(len(created))
+                 if (lo_us is None or created[row] >= lo_us)
+                 and (hi_us is None or created[row] < hi_us)),
+                key=created.__getitem__,
+            )
+        flags = self._flags
+        return [self._task(row) for row in rows if not flags[row] & _DELETED]
+
+    def update(self, task_id: int, title: str | None = None,
+               description: str | None = None) -> Task | None:
+        """Update task fields. Returns updated task or None if not found."""
+        row = self._row(task_id)
+        if row is None:
+            return None
+        if title is not None:
+            self._release(self._titles[row])
+            self._titles[row] = self._share(title)
+        if description is not None:
+            self._release(self._descriptions[row])
+            self._descriptions[row] = self._share(description)
+        return self._task(row)
+
+    def delete(self, task_id: int) -> Task | None:
+        """Delete task by ID. Returns deleted task or None if not found."""
+        row = self._row(task_id)
+        if row is None:
+            return None
+        task = self._task(row)
+        self._completed -= task.completed
+        self._live -= 1
+        self._flags[row] = _DELETED
+        self._release(self._titles[row])
+        self._release(self._descriptions[row])
+        self._titles[row] = ""
+        self._descriptions[row] = ""
+        return task
+
+    def toggle_complete(self, task_id: int) -> Task | None:
+        """Toggle task completion status. Returns task or None if not found."""
+        row = self._row(task_id)
+        if row is None:
+            return None
+        self._flags[row] ^= _COMPLETED
+        self._completed += 1 if self._flags[row] & _COMPLETED else -1
+        return self._task(row)
@@ -1,6 +1,19 @@
 """Todo application main entry point."""
 
-from todo.storage import TaskStorage
+import argparse
+import csv
+import sys
+import time
+from itertools import islice
+
+from todo.batch import FORMATS, export_tasks, import_tasks
+from todo.compact import CompactTaskStorage
+from todo.models import Task
+from todo.persistence import PersistentTaskStorage
+from todo.storage import TaskStorage, TaskStore
+
+DEFAULT_PAGE_SIZE = 20
+STATUS_FILTERS = {"all": None, "pending": False, "completed": True}
 
 
 def display_menu() -> None:
@@ -24,7 +37,7 @@ def get_task_id() -> int | None:
         return None
 
 
-def add_task(storage: TaskStorage) -> None:
+def add_task(storage: TaskStore) -> None:
     """Handle adding a new task."""
     title = input("Enter title: ").strip()
 
@@ -46,26 +59,52 @@ def add_task(storage: TaskStorage) -> None:
     print(f"Task #{task.id} created: {task.title}")
 
 
-def view_tasks(storage: TaskStorage) -> None:
-    """Display all tasks."""
-    tasks = storage.get_all()
+def format_task(task: Task) -> str:
+    """Render one task as it appears in the task list."""
+    status = "[X]" if task.completed else "[ ]"
+    description = task.description or "No description"
+    return (f"{status} #{task.id} - {task.title} "
+            f"(created: {task.created_at.date().isoformat()})\n"
+            f"    {description}\n")
 
-    if not tasks:
-        print("No tasks found.")
-        return
 
-    print()
-    for task in tasks:
-        status = "[X]" if task.completed else "[ ]"
-        date_str = task.created_at.strftime("%Y-%m-%d")
-        print(f"{status} #{task.id} - {task.title} (created: {date_str})")
-        if task.description:
-            print(f"    {task.description}")
-        else:
-            print("    No description")
+def get_status_filter() -> bool | None:
+    """Prompt for which tasks to show; returns the ``completed`` filter."""
+    choice = input("Show (a)ll, (p)ending or (c)ompleted tasks? [a]: ")
+    choice = choice.strip().lower()[:1]
+    return {"p": False, "c": True}.get(choice)
+
 
+def view_tasks(storage: TaskStore, page_size: int = DEFAULT_PAGE_SIZE,
+               completed: bool | None = None) -> None:
+    """Display tasks one page at a time.
 
-def update_task(storage: TaskStorage) -> None:
+    Iterates the store directly instead of copying it, so each page costs
+    O(page size), and writes each page with a single buffered write.
+    """
+    total = storage.count(completed)
+    if not total:
+        print("No tasks found.")
+        return
+
+    tasks = storage.iter_tasks(completed)
+    shown = 0
+    while True:
+        page = [format_task(task) for task in islice(tasks, page_size)]
+        if not page:
+            return
+        start = shown + 1
+        shown += len(page)
+        page.insert(0, "\n")
+        page.append(f"-- Tasks {start}-{shown} of {total} --\n")
+        sys.stdout.write("".join(page))
+        if shown >= total:
+            return
+        if input("Press Enter for more, q to stop: ").strip().lower() == "q":
+            return
+
+
+def update_task(storage: TaskStore) -> None:
     """Handle updating a task."""
     task_id = get_task_id()
     if task_id is None:
@@ -102,7 +141,7 @@ def update_task(storage: TaskStorage) -> None:
     print(f"Task #{task_id} updated.")
 
 
-def delete_task(storage: TaskStorage) -> None:
+def delete_task(storage: TaskStore) -> None:
     """Handle deleting a task."""
     task_id = get_task_id()
     if task_id is None:
@@ -116,7 +155,7 @@ def delete_task(storage: TaskStorage) -> None:
     print(f"Task #{task_id} deleted: {task.title}")
 
 
-def toggle_complete(storage: TaskStorage) -> None:
+def toggle_complete(storage: TaskStore) -> None:
     """Handle toggling task completion."""
     task_id = get_task_id()
     if task_id is None:
@@ -131,10 +170,8 @@ def toggle_complete(storage: TaskStorage) -> None:
     print(f"Task #{task_id} marked as {status}.")
 
 
-def main() -> None:
-    """Main application loop."""
-    storage = TaskStorage()
-
+def run_menu(storage: TaskStore, page_size: int = DEFAULT_PAGE_SIZE) -> None:
+    """Run the interactive menu until the user exits."""
     while True:
         display_menu()
         choice = input("Choose option (1-6): ").strip()
@@ -142,7 +179,7 @@ def main() -> None:
         if choice == "1":
             add_task(storage)
         elif choice == "2":
-            view_tasks(storage)
+            view_tasks(storage, page_size, get_status_filter())
         elif choice == "3":
             update_task(storage)
         elif choice == "4":
@@ -156,5 +193,115 @@ def main() -> None:
             print("Invalid option. Please choose 1-6.")
 
 
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(prog="todo", description="Todo console app")
+    parser.add_argument(
+        "--data-dir",
+        help="persist tasks in this directory (default: in-memory only)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="use column storage to cut memory use on very large task sets",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"tasks per page when viewing (default: {DEFAULT_PAGE_SIZE})",
+    )
+    commands = parser.add_subparsers(
+        dest="command",
+        description="run without a command for the interactive menu",
+    )
+    import_parser = commands.add_parser(
+        "import", help="bulk-load tasks from JSONL/CSV files ('-' for stdin)"
+    )
+    import_parser.add_argument("files", nargs="+")
+    export_parser = commands.add_parser(
+        "export", help="write tasks to a JSONL/CSV file ('-' for stdout)"
+    )
+    export_parser.add_argument("file")
+    export_parser.add_argument(
+        "--status", choices=list(STATUS_FILTERS), default="all"
+    )
+    for command_parser in (import_parser, export_parser):
+        command_parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="file format (default: from the file extension)",
+        )
+
+    args = parser.parse_args(argv)
+    if args.compact and args.data_dir:
+        parser.error("--compact cannot be combined with --data-dir")
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    return args
+
+
+def open_storage(data_dir: str | None, compact: bool = False) -> TaskStore:
+    """Return the storage backend selected on the command line."""
+    if data_dir:
+        return PersistentTaskStorage(data_dir)
+    if compact:
+        return CompactTaskStorage()
+    return TaskStorage()
+
+
+def run_import(storage: TaskStore, files: list[str], fmt: str | None) -> int:
+    """Import task files and report progress. Returns an exit status."""
+    status = 0
+    for path in files:
+        start = time.perf_counter()
+        try:
+            added, skipped, errors = import_tasks(storage, path, fmt)
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        elapsed = time.perf_counter() - start
+        print(f"{path}: imported {added} tasks in {elapsed:.2f}s", file=sys.stderr)
+        if skipped:
+            status = 1
+            print(f"{path}: skipped {skipped} invalid rows", file=sys.stderr)
+            for message in errors:
+                print(f"  {message}", file=sys.stderr)
+    return status
+
+
+def run_export(storage: TaskStore, path: str, fmt: str | None,
+               status_filter: str) -> int:
+    """Export tasks and report progress. Returns an exit status."""
+    completed = STATUS_FILTERS[status_filter]
+    start = time.perf_counter()
+    try:
+        count = export_tasks(storage, path, fmt, completed)
+    except (OSError, ValueError) as e:
+        print(f"{path}: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"{path}: exported {count} tasks in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a batch command, or the interactive menu if none is given."""
+    args = parse_args(argv)
+    storage = open_storage(args.data_dir, args.compact)
+
+    try:
+        if args.command == "import":
+            return run_import(storage, args.files, args.format)
+        if args.command == "export":
+            return run_export(storage, args.file, args.format, args.status)
+        run_menu(storage, args.page_size)
+        return 0
+    finally:
+        if isinstance(storage, PersistentTaskStorage):
+            storage.close()
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""Durable task storage backed by an append-only journal and snapshots."""
+
+import json
+import os
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self, TextIO
+
+from todo.models import Task
+from todo.storage import TaskStorage
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+JOURNAL_FILE = "journal.jsonl"
+
+
+def task_to_record(task: Task) -> dict[str, Any]:
+    """Serialize a task to a JSON-compatible dict."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "completed": task.completed,
+        "created_at": task.created_at.isoformat(),
+    }
+
+
+def task_from_record(record: dict[str, Any]) -> Task:
+    """Build a task from a dict produced by ``task_to_record``."""
+    return Task(
+        id=record["id"],
+        title=record["title"],
+        description=record.get("description", ""),
+        completed=record.get("completed", False),
+        created_at=datetime.fromisoformat(record["created_at"]),
+    )
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make a rename inside ``path`` durable (no-op where unsupported)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class Journal:
+    """Append-only JSON-lines log with batched fsync.
+
+    Records are written immediately but only forced to disk every
+    ``sync_every`` records or ``sync_interval`` seconds, whichever comes
+    first, and on ``sync``/``close``. A crash can lose at most the last
+    unsynced batch; a torn final line is ignored on replay.
+
+    Pass ``valid_length`` from ``scan`` to cut a torn tail off before
+    appending; otherwise the next record would be glued onto it and
+    replay would stop there for good.
+    """
+
+    def __init__(self, path: Path, sync_every: int = 64,
+                 sync_interval: float = 1.0,
+                 valid_length: int | None = None) -> None:
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file: TextIO = open(path, "a", encoding="utf-8")
+        if valid_length is not None and self._file.tell() > valid_length:
+            self._file.truncate(valid_length)
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.records = 0
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Write one record, syncing if the batch is full or stale."""
+        self._file.write(_dumps(record) + "\n")
+        self._pending += 1
+        self.records += 1
+        if (self._pending >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+    def append_many(self, records: Iterable[dict[str, Any]]) -> None:
+        """Write a batch of records followed by a single sync."""
+        for record in records:
+            self._file.write(_dumps(record) + "\n")
+            self._pending += 1
+            self.records += 1
+        self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered records and fsync the journal."""
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def reset(self) -> None:
+        """Discard all records; called once they are covered by a snapshot."""
+        self._file.flush()
+        self._file.seek(0)
+        self._file.truncate()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self.records = 0
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    @staticmethod
+    def scan(path: Path) -> tuple[list[dict[str, Any]], int]:
+        """Return the complete records at ``path`` and the bytes they span."""
+        records: list[dict[str, Any]] = []
+        length = 0
+        if not path.exists():
+            return records, length
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # Torn write from a crash; nothing valid can follow it.
+                    break
+                length += len(line)
+        return records, length
+
+    @staticmethod
+    def read(path: Path) -> list[dict[str, Any]]:
+        """Return all complete records in the journal at ``path``."""
+        return Journal.scan(path)[0]
+
+
+class PersistentTaskStorage(TaskStorage):
+    """Task storage that survives restarts.
+
+    Every mutation is appended to ``journal.jsonl`` in ``data_dir``. Once
+    the journal holds more records than the last snapshot held tasks (and
+    at least ``compact_min``), the current state is written to
+    ``snapshot.jsonl`` and the journal is emptied, so compaction cost is
+    amortized to O(1) per operation and startup only replays a journal
+    tail no longer than the snapshot it follows.
+    """
+
+    def __init__(self, data_dir: str | Path, sync_every: int = 64,
+                 sync_interval: float = 1.0,
+                 compact_min: int = 10_000) -> None:
+        super().__init__()
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_min = compact_min
+        self._seq = 0
+        self._snapshot_size = 0
+        self._load()
+        self._journal = Journal(self.data_dir / JOURNAL_FILE,
+                                sync_every=sync_every,
+                                sync_interval=sync_interval,
+                                valid_length=self._journal_length)
+        self._journal.records = self._replayed
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc: BaseException | None,
+                 tb: TracebackType | None) -> None:
+        self.close()
+
+    def _load(self) -> None:
+        """Load the snapshot, then replay journal records newer than it."""
+        snapshot_path = self.data_dir / SNAPSHOT_FILE
+        if snapshot_path.exists():
+            with open(snapshot_path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                self._seq = header["seq"]
+                self._next_id = header["next_id"]
+                for line in f:
+                    self._insert(task_from_record(json.loads(line)),
+                                 keep_sorted=False)
+            self._snapshot_size = len(self)
+
+        self._replayed = 0
+        records, self._journal_length = Journal.scan(self.data_dir / JOURNAL_FILE)
+        for record in records:
+            if record["seq"] <= self._seq:
+                continue
+            self._apply(record)
+            self._seq = record["seq"]
+            self._replayed += 1
+        self._sort_created()
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        """Replay one journal record against the in-memory indexes."""
+        op = record["op"]
+        if op == "add":
+            self._insert(task_from_record(record), keep_sorted=False)
+            self._next_id = max(self._next_id, record["id"] + 1)
+        elif op == "update":
+            super().update(record["id"], record.get("title"),
+                           record.get("description"))
+        elif op == "delete":
+            super().delete(record["id"])
+        elif op == "toggle":
+            task = self.get_by_id(record["id"])
+            if task is not None and task.completed != record["completed"]:
+                super().toggle_complete(record["id"])
+
+    def _log(self, op: str, **fields: Any) -> None:
+        self._seq += 1
+        self._journal.append({"seq": self._seq, "op": op, **fields})
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if self._journal.records >= max(self.compact_min, self._snapshot_size):
+            self.compact()
+
+    def add(self, title: str, description: str = "") -> Task:
+        """Create a new task and journal it."""
+        task = super().add(title, description)
+        self._log("add", **task_to_record(task))
+        return task
+
+    def add_many(self, records: Iterable[dict[str, Any]]) -> int:
+        """Insert tasks in bulk, journaling them with a single sync.
+
+        If the batch is big enough to trigger compaction anyway, it goes
+        straight into a new snapshot instead of through the journal. If
+        ``records`` raises partway, the tasks added before the error are
+        still made durable before the error propagates.
+        """
+        first_id = self._next_id
+        try:
+            return super().add_many(records)
+        finally:
+            self._log_added(first_id)
+
+    def _log_added(self, first_id: int) -> None:
+        """Journal (or snapshot) the tasks with IDs from ``first_id`` on."""
+        added = self._next_id - first_id
+        if not added:
+            return
+        tasks = self._tasks
+        first_seq = self._seq
+        self._seq += added
+        if self._journal.records + added >= max(self.compact_min,
+                                                self._snapshot_size):
+            self.compact()
+            return
+        self._journal.append_many(
+            {"seq": first_seq + offset + 1, "op": "add",
+             **task_to_record(tasks[first_id + offset])}
+            for offset in range(added)
+        )
+        self._maybe_compact()
+
+    def update(self, task_id: int, title: str | None = None,
+               description: str | None = None) -> Task | None:
+        """Update task fields and journal the change."""
+        task = super().update(task_id, title, description)
+        if task is not None:
+            self._log("update", id=task_id, title=title,
+                      description=description)
+        return task
+
+    def delete(self, task_id: int) -> Task | None:
+        """Delete a task and journal the deletion."""
+        task = super().delete(task_id)
+        if task is not None:
+            self._log("delete", id=task_id)
+        return task
+
+    def toggle_complete(self, task_id: int) -> Task | None:
+        """Toggle completion and journal the resulting status."""
+        task = super().toggle_complete(task_id)
+        if task is not None:
+            self._log("toggle", id=task_id, completed=task.completed)
+        return task
+
+    def compact(self) -> None:
+        """Write a snapshot of the current state and empty the journal."""
+        self._journal.sync()
+        snapshot_path = self.data_dir / SNAPSHOT_FILE
+        tmp_path = snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(_dumps({"seq": self._seq, "next_id": self._next_id}) + "\n")
+            f.writelines(_dumps(task_to_record(task)) + "\n" for task in self)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, snapshot_path)
+        _fsync_dir(self.data_dir)
+        self._snapshot_size = len(self)
+        # Records up to self._seq are now in the snapshot. If we crash
+        # before the reset below, replay skips them by sequence number.
+        self._journal.reset()
+
+    def sync(self) -> None:
+        """Force all journaled changes to disk."""
+        self._journal.sync()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        self._journal.close()
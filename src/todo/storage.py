@@ -1,15 +1,76 @@
 """In-memory task storage."""
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any, Protocol
+
 from todo.models import Task
 
 
+class TaskStore(Protocol):
+    """Interface shared by the task storage backends."""
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[Task]: ...
+
+    def __contains__(self, task_id: object) -> bool: ...
+
+    def add(self, title: str, description: str = "") -> Task: ...
+
+    def add_many(self, records: Iterable[dict[str, Any]]) -> int: ...
+
+    def get_all(self) -> list[Task]: ...
+
+    def get_by_id(self, task_id: int) -> Task | None: ...
+
+    def get_by_status(self, completed: bool) -> list[Task]: ...
+
+    def iter_tasks(self, completed: bool | None = None) -> Iterator[Task]: ...
+
+    def count(self, completed: bool | None = None) -> int: ...
+
+    def get_created_between(self, start: datetime | None = None,
+                            end: datetime | None = None) -> list[Task]: ...
+
+    def update(self, task_id: int, title: str | None = None,
+               description: str | None = None) -> Task | None: ...
+
+    def delete(self, task_id: int) -> Task | None: ...
+
+    def toggle_complete(self, task_id: int) -> Task | None: ...
+
+
 class TaskStorage:
-    """Manages in-memory task storage."""
+    """Manages in-memory task storage.
+
+    Tasks are indexed by ID in an insertion-ordered dict, so lookups and
+    mutations are O(1) regardless of how many tasks are stored. Two
+    secondary indexes are maintained alongside it:
+
+    - completed/pending: one ID-keyed dict per status, for O(1) counts and
+      filtered iteration without scanning the whole store.
+    - created_at: an append-only list of ``(created_at, id)`` pairs that
+      stays sorted because tasks are created in time order. Deleted IDs are
+      skipped lazily and purged once they make up half the list.
+    """
 
     def __init__(self) -> None:
-        self._tasks: list[Task] = []
+        self._tasks: dict[int, Task] = {}
+        self._by_status: dict[bool, dict[int, Task]] = {False: {}, True: {}}
+        self._created: list[tuple[datetime, int]] = []
         self._next_id: int = 1
 
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks.values())
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
     def add(self, title: str, description: str = "") -> Task:
         """Create a new task and return it."""
         task = Task(
@@ -17,25 +78,107 @@ class TaskStorage:
             title=title,
             description=description
         )
-        self._tasks.append(task)
+        self._insert(task)
         self._next_id += 1
         return task
 
+    def add_many(self, records: Iterable[dict[str, Any]]) -> int:
+        """Insert tasks in bulk and return how many were added.
+
+        Each record needs a ``title`` and may set ``description``,
+        ``completed`` and ``created_at``; IDs are assigned by the store.
+        Records are consumed one at a time, so ``records`` can be a stream.
+        """
+        tasks = self._tasks
+        by_status = self._by_status
+        created = self._created
+        first_id = next_id = self._next_id
+        start = len(created)
+        try:
+            for record in records:
+                task = Task(
+                    next_id,
+                    record["title"],
+                    record.get("description") or "",
+                    bool(record.get("completed", False)),
+                    record.get("created_at") or datetime.now(),
+                )
+                tasks[next_id] = task
+                by_status[task.completed][next_id] = task
+                created.append((task.created_at, next_id))
+                next_id += 1
+        finally:
+            self._next_id = next_id
+            self._sort_created(start)
+        return next_id - first_id
+
+    def _insert(self, task: Task, keep_sorted: bool = True) -> None:
+        """Register a task in the primary and secondary indexes.
+
+        Bulk loaders pass ``keep_sorted=False`` and call ``_sort_created``
+        when done, as a sorted insert costs O(n) per out-of-order task.
+        """
+        self._tasks[task.id] = task
+        self._by_status[task.completed][task.id] = task
+        created = self._created
+        if keep_sorted and created and task.created_at < created[-1][0]:
+            # Clock went backwards; keep the index sorted.
+            created.insert(bisect_right(created, (task.created_at, task.id)),
+                           (task.created_at, task.id))
+        else:
+            created.append((task.created_at, task.id))
+
+    def _sort_created(self, start: int = 0) -> None:
+        """Restore created_at order if entries from ``start`` on broke it."""
+        # Imported timestamps need not be in order; one sort of the
+        # whole index is far cheaper than a sorted insert per task.
+        created = self._created
+        if any(created[i] > created[i + 1]
+               for i in range(max(start - 1, 0), len(created) - 1)):
+            created.sort()
+
     def get_all(self) -> list[Task]:
         """Return all tasks."""
-        return self._tasks.copy()
+        return list(self._tasks.values())
 
     def get_by_id(self, task_id: int) -> Task | None:
         """Find task by ID, returns None if not found."""
-        for task in self._tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._tasks.get(task_id)
+
+    def get_by_status(self, completed: bool) -> list[Task]:
+        """Return all completed or all pending tasks."""
+        return list(self._by_status[completed].values())
+
+    def iter_tasks(self, completed: bool | None = None) -> Iterator[Task]:
+        """Iterate tasks without copying, optionally filtered by status.
+
+        Unfiltered iteration is in ID order. Filtered iteration walks the
+        status index, so tasks appear in the order they entered that status.
+        """
+        if completed is None:
+            return iter(self._tasks.values())
+        return iter(self._by_status[completed].values())
+
+    def count(self, completed: bool | None = None) -> int:
+        """Count tasks, optionally only those with the given status."""
+        if completed is None:
+            return len(self._tasks)
+        return len(self._by_status[completed])
+
+    def get_created_between(self, start: datetime | None = None,
+                            end: datetime | None = None) -> list[Task]:
+        """Return tasks created in ``[start, end)``, oldest first."""
+        created = self._created
+        lo = 0 if start is None else bisect_left(created, (start,))
+        hi = len(created) if end is None else bisect_left(created, (end,))
+        tasks = self._tasks
+        return [tasks[task_id] for _, task_id in created[lo:hi]
+                if task_id in tasks]
 
     def update(self, task_id: int, title: str | None = None,
                description: str | None = None) -> Task | None:
         """Update task fields. Returns updated task or None if not found."""
-        task = self.get_by_id(task_id)
+        task = self._tasks.get(task_id)
         if task is None:
             return None
         if title is not None:
@@ -46,16 +189,25 @@ class TaskStorage:
 
     def delete(self, task_id: int) -> Task | None:
         """Delete task by ID. Returns deleted task or None if not found."""
-        task = self.get_by_id(task_id)
+        task = self._tasks.pop(task_id, None)
         if task is None:
             return None
-        self._tasks.remove(task)
+        del self._by_status[task.completed][task_id]
+        if len(self._created) > 2 * len(self._tasks) + 64:
+            self._compact_created()
         return task
 
     def toggle_complete(self, task_id: int) -> Task | None:
         """Toggle task completion status. Returns task or None if not found."""
-        task = self.get_by_id(task_id)
+        task = self._tasks.get(task_id)
         if task is None:
             return None
+        del self._by_status[task.completed][task_id]
         task.completed = not task.completed
+        self._by_status[task.completed][task_id] = task
         return task
+
+    def _compact_created(self) -> None:
+        """Drop deleted IDs from the created_at index."""
+        tasks = self._tasks
+        self._created = [entry for entry in self._created if entry[1] in tasks]
@@ -0,0 +1,68 @@
+"""Tests for the console app's JSONL/CSV import and export."""
+
+from pathlib import Path
+
+from todo.batch import export_tasks, import_tasks
+from todo.main import run_import
+from todo.storage import TaskStorage
+
+
+def test_import_jsonl_skips_invalid_rows(tmp_path: Path):
+    """Test that bad rows are counted and reported while the rest load."""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(
+        '{"title": "Buy milk", "completed": "yes"}\n'
+        '\n'
+        '{"title": ""}\n'
+        'not json\n'
+        '{"title": "Call mum", "created_at": "2024-01-02T03:04:05"}\n',
+        encoding="utf-8",
+    )
+    storage = TaskStorage()
+
+    added, skipped, errors = import_tasks(storage, str(path))
+
+    assert (added, skipped) == (2, 2)
+    assert errors[0] == "line 3: title cannot be empty"
+    assert errors[1].startswith("line 4: ")
+    milk, mum = storage
+    assert milk.completed and not mum.completed
+    assert mum.created_at.isoformat() == "2024-01-02T03:04:05"
+
+
+def test_export_then_import_csv_round_trips(tmp_path: Path):
+    """Test that a CSV export imports back to the same tasks."""
+    source = TaskStorage()
+    source.add("Write, report", 'Say "hi"\nsecond line')
+    source.toggle_complete(source.add("Done").id)
+    source.add("Pending")
+    path = tmp_path / "tasks.csv"
+
+    assert export_tasks(source, str(path)) == 3
+    copy = TaskStorage()
+    assert import_tasks(copy, str(path)) == (3, 0, [])
+
+    def fields(storage):
+        return [(t.title, t.description, t.completed, t.created_at) for t in storage]
+
+    assert fields(copy) == fields(source)
+
+
+def test_export_filters_by_status(tmp_path: Path):
+    """Test exporting only pending tasks as JSONL."""
+    storage = TaskStorage()
+    storage.toggle_complete(storage.add("Done").id)
+    storage.add("Pending")
+    path = tmp_path / "pending.jsonl"
+
+    assert export_tasks(storage, str(path), completed=False) == 1
+    assert '"title": "Pending"' in path.read_text(encoding="utf-8")
+
+
+def test_run_import_reports_malformed_csv(tmp_path: Path, capsys):
+    """Test that a CSV the parser rejects fails the command instead of crashing."""
+    path = tmp_path / "tasks.csv"
+    path.write_text("title\n" + "x" * 200_000 + "\n", encoding="utf-8")
+
+    assert run_import(TaskStorage(), [str(path)], None) == 1
+    assert "field larger than field limit" in capsys.readouterr().err
@@ -0,0 +1,20 @@
+"""Tests for the console app's column-oriented storage."""
+
+from todo.compact import CompactTaskStorage
+
+
+def test_replaced_and_deleted_strings_leave_the_pool():
+    """Test that strings no row holds any more are freed."""
+    store = CompactTaskStorage()
+    first = store.add("Buy milk", "2 litres")
+    second = store.add("".join(["Buy ", "milk"]))
+    assert first.title is second.title
+
+    store.update(first.id, title="Call mum", description="")
+    assert store.get_by_id(second.id).title == "Buy milk"
+    store.delete(second.id)
+    store.add_many([{"title": "Fix car"}])
+    store.delete(first.id)
+
+    assert store._strings == {"Fix car": "Fix car"}
+    assert store._refs == {"Fix car": 1}
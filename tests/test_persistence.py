@@ -0,0 +1,61 @@
+"""Tests for the console app's journaled storage."""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from todo.batch import import_tasks
+from todo.persistence import JOURNAL_FILE, PersistentTaskStorage
+
+
+def titles(data_dir: Path) -> list[str]:
+    with PersistentTaskStorage(data_dir) as storage:
+        return [task.title for task in storage]
+
+
+def test_appends_after_torn_tail_survive_restart(tmp_path: Path):
+    """Test that records written after a crash's torn line are replayed."""
+    with PersistentTaskStorage(tmp_path) as storage:
+        storage.add("a")
+        storage.add("b")
+    with open(tmp_path / JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write('{"seq":3,"op":"ad')  # Crash mid-write
+
+    with PersistentTaskStorage(tmp_path) as storage:
+        assert [task.title for task in storage] == ["a", "b"]
+        storage.add("c")
+        storage.add("d")
+
+    assert titles(tmp_path) == ["a", "b", "c", "d"]
+
+
+def test_rows_imported_before_a_stream_error_survive_restart(tmp_path: Path):
+    """Test that tasks added before an import stream fails are journaled."""
+    source = tmp_path / "tasks.jsonl"
+    source.write_bytes(b"".join(b'{"title": "t%d"}\n' % i for i in range(2000))
+                       + b"\xff\n")
+    data_dir = tmp_path / "data"
+
+    with PersistentTaskStorage(data_dir, compact_min=10_000) as storage:
+        with pytest.raises(UnicodeDecodeError):
+            import_tasks(storage, str(source))
+        added = len(storage)
+
+    assert added > 0
+    assert len(titles(data_dir)) == added
+
+
+def test_restart_keeps_created_index_sorted(tmp_path: Path):
+    """Test that out-of-order timestamps load into a sorted created_at index."""
+    days = [5, 1, 4, 2, 3]
+    records = [{"title": f"day {day}", "created_at": datetime(2024, 1, day)}
+               for day in days]
+    with PersistentTaskStorage(tmp_path, compact_min=2) as storage:
+        storage.add_many(records[:3])  # Snapshotted
+        storage.add_many(records[3:])  # Journaled
+
+    with PersistentTaskStorage(tmp_path) as storage:
+        ordered = storage.get_created_between(datetime(2024, 1, 2))
+    assert [task.title for task in ordered] == ["day 2", "day 3", "day 4",
+                                                "day 5"]